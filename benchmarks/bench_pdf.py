@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import time
+import warnings
+
+from fpdf import FPDF
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ideb import SLIK_FORMATS, apply_slik_format, build_facility_table, safe_text  # noqa: E402
+from pdftable import render_table  # noqa: E402
+from synthetic import facility_list, generate_ideb  # noqa: E402
+
+# Benchmark tabel PDF: renderer lama (pdf.cell per sel, lebar kolom tetap) vs pdftable.render_table
+# Jalankan: python benchmarks/bench_pdf.py --rows 100 1000 5000
+
+def make_facilities(n, seed=0):
+    return build_facility_table(facility_list(generate_ideb(n, seed=seed)))
+
+def legacy_table(pdf, df):
+    # Salinan logika tabel export_pdf sebelum pdftable (untuk pembanding)
+    pdf.set_font("Helvetica", 'B', 6)
+    if "Restrukturisasi Iya" in df.columns: w = [7, 25, 45, 35, 25, 18, 18, 20, 16, 30, 30]
+    elif "OS (Rp)" in df.columns: w = [7, 20, 36, 25, 22, 22, 18, 18, 12, 12, 16, 10, 15, 15]
+    else: w = [7, 40, 30, 22, 28, 28, 20, 20, 15, 15, 15, 37]
+    for i, c in enumerate(df.columns):
+        pdf.cell(w[i], 8, safe_text(c)[:int(w[i]*0.9)], 1, 0, 'C')
+    pdf.ln()
+    pdf.set_font("Helvetica", size=5)
+    for _, r in df.iterrows():
+        for i, col in enumerate(df.columns):
+            pdf.cell(w[i], 7, safe_text(r[col])[:int(w[i] * 0.95)], 1, 0, 'L' if i in [1, 2, 3] else 'C')
+        pdf.ln()
+
+def new_table(pdf, df):
+    render_table(pdf, df, align={c: "L" for c in df.columns[1:4]})
+
+def run_once(renderer, df):
+    start = time.perf_counter()
+    pdf = FPDF('L', 'mm', 'A4'); pdf.add_page()
+    renderer(pdf, df)
+    out = bytes(pdf.output())
+    return time.perf_counter() - start, len(out), pdf.pages_count
+
+def main(argv=None):
+    warnings.filterwarnings("ignore", category=DeprecationWarning)  # renderer lama memakai parameter `ln` fpdf2 yang sudah deprecated
+    ap = argparse.ArgumentParser(description="Benchmark renderer tabel PDF")
+    ap.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    print(f"{'format':<18}{'rows':>7}{'renderer':>10}{'best (s)':>11}{'pages':>7}{'bytes':>10}")
+    for n in args.rows:
+        base = make_facilities(n)
+        for sel_format in SLIK_FORMATS:
+            df = apply_slik_format(base, sel_format)
+            for name, renderer in (("legacy", legacy_table), ("pdftable", new_table)):
+                runs = [run_once(renderer, df) for _ in range(args.repeat)]
+                best = min(r[0] for r in runs)
+                print(f"{sel_format:<18}{n:>7}{name:>10}{best:>11.3f}{runs[0][2]:>7}{runs[0][1]:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+from ideb import SLIK_FORMATS, apply_filters, apply_slik_format, build_facility_table, parse_ideb, parse_ideb_stream  # noqa: E402
+from portfolio import build_portfolio  # noqa: E402
+from synthetic import facility_list, generate_bytes, generate_ideb  # noqa: E402
+
+# Harness benchmark per tahap pipeline (parse -> tabel fasilitas -> filter -> format slik -> ekspor) di atas data sintetis.
+# Hasil ditulis ke JSON agar regresi antar commit terlihat:
+#   python benchmarks/run.py --facilities 50 500 5000 -o bench.json
+#   python benchmarks/run.py --facilities 50 500 5000 --compare bench.json
+
+SLIK_SHORT = {"slik 1 (Default)": "slik1", "slik 2 (Aldista)": "slik2", "slik 3 (Egie)": "slik3"}
+DEFAULT_THRESHOLD = 0.10  # perlambatan > 10% dianggap regresi
+MIN_DELTA_S = 0.005  # selisih di bawah 5 ms dianggap noise, walau rasionya besar
+
+def timeit(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+def _exporters():
+    try:
+        from exporters import export_excel, export_pdf, export_word
+    except ImportError:
+        return {}
+    return {"xlsx": export_excel, "docx": export_word, "pdf": export_pdf}
+
+def bench_size(n, files, repeat, exports, seed=0):
+    # Satu ukuran debitur: tiap tahap diukur terpisah dengan input yang sudah disiapkan tahap sebelumnya
+    raw = generate_bytes(n, seed=seed)
+    doc = generate_ideb(n, seed=seed)
+    facs = facility_list(doc)
+    parsed = parse_ideb(raw)
+    df = parsed.facilities
+    banks = list(df["NAMA JASA KEUANGAN"].unique()[:2])
+    filters = {"bank": banks, "kondisi": ["Fasilitas Aktif"]}
+    id_info, aud_info = parsed.identity.as_dict(), parsed.summary.as_dict()
+
+    stages = [
+        ("parse", lambda: parse_ideb(raw)),
+        ("parse_stream", lambda: parse_ideb_stream(io.BytesIO(raw))),
+        ("build_facility_table", lambda: build_facility_table(facs)),
+        ("filter", lambda: apply_filters(df, **filters)),
+    ]
+    for fmt in SLIK_FORMATS:
+        stages.append((f"map_{SLIK_SHORT[fmt]}", lambda fmt=fmt: apply_slik_format(df, fmt)))
+    # Ekspor memakai format default (slik 1); Excel menerima nominal native seperti di build_report
+    for kind, fn in exports.items():
+        frame = apply_slik_format(df, SLIK_FORMATS[0], keep_money=(kind == "xlsx"))
+        stages.append((f"export_{kind}", lambda fn=fn, frame=frame: fn(id_info, aud_info, frame)))
+    if files > 1:
+        # Sesi multi-file: parse seluruh file lalu gabungkan menjadi portofolio
+        raws = [generate_bytes(n, seed=seed + i) for i in range(files)]
+        parsed_files = [(f"ideb_{i}.txt", parse_ideb(r)) for i, r in enumerate(raws)]
+        stages.append(("session_parse", lambda: [parse_ideb(r) for r in raws]))
+        stages.append(("session_portfolio", lambda: build_portfolio(parsed_files)))
+
+    results = []
+    for stage, fn in stages:
+        best, median = timeit(fn, repeat)
+        results.append({"stage": stage, "facilities": n, "files": files if stage.startswith("session_") else 1,
+                        "bytes": len(raw), "best_s": round(best, 6), "median_s": round(median, 6)})
+        print(f"{stage:<22}{n:>8}{results[-1]['files']:>6}{best:>11.4f}{median:>11.4f}", flush=True)
+    return results
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_meta(args):
+    versions = {"python": platform.python_version(), "pandas": pd.__version__}
+    for mod in ("openpyxl", "docx", "fpdf"):
+        try: versions[mod] = getattr(__import__(mod), "__version__", "?")
+        except ImportError: versions[mod] = None
+    return {"commit": git_commit(), "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "platform": platform.platform(), "cpu_count": os.cpu_count(), "versions": versions,
+            "facilities": args.facilities, "files": args.files, "repeat": args.repeat}
+
+def compare(results, baseline_path, threshold, min_delta=MIN_DELTA_S):
+    # Dibandingkan dengan waktu terbaik (best_s) karena paling tahan terhadap gangguan proses lain
+    with open(baseline_path, encoding="utf-8") as fh: baseline = json.load(fh)
+    old = {(r["stage"], r["facilities"], r["files"]): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\nPembanding: {baseline_path} (commit {baseline.get('meta', {}).get('commit')})")
+    print(f"{'stage':<22}{'fas':>8}{'lama':>11}{'baru':>11}{'rasio':>8}")
+    for r in results:
+        prev = old.get((r["stage"], r["facilities"], r["files"]))
+        if prev is None or not prev["best_s"]: continue
+        ratio = r["best_s"] / prev["best_s"]
+        flag = ""
+        if ratio > 1 + threshold and r["best_s"] - prev["best_s"] > min_delta:
+            flag = "  REGRESI"; regressions.append(r)
+        print(f"{r['stage']:<22}{r['facilities']:>8}{prev['best_s']:>11.4f}{r['best_s']:>11.4f}{ratio:>8.2f}{flag}")
+    return regressions
+
+def main(argv=None):
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    ap = argparse.ArgumentParser(description="Benchmark pipeline iDEB per tahap")
+    ap.add_argument("--facilities", type=int, nargs="+", default=[50, 500, 2000], help="Jumlah fasilitas per debitur")
+    ap.add_argument("--files", type=int, default=5, help="Jumlah file untuk tahap sesi multi-file (1 = dilewati)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-export", action="store_true", help="Lewati tahap ekspor xlsx/docx/pdf")
+    ap.add_argument("--export-max", type=int, default=5000, help="Ekspor hanya diukur sampai jumlah fasilitas ini")
+    ap.add_argument("-o", "--out", help="Tulis hasil ke file JSON")
+    ap.add_argument("--compare", help="File JSON hasil sebelumnya sebagai pembanding")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Batas perlambatan relatif sebelum ditandai regresi")
+    args = ap.parse_args(argv)
+
+    exports = {} if args.no_export else _exporters()
+    print(f"{'stage':<22}{'fas':>8}{'files':>6}{'best (s)':>11}{'median (s)':>11}")
+    results = []
+    for n in args.facilities:
+        results.extend(bench_size(n, args.files, args.repeat, exports if n <= args.export_max else {}))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"meta": run_meta(args), "results": results}, fh, indent=2)
+        print(f"\nHasil ditulis ke {args.out}")
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import random
+from datetime import date
+
+# Generator dokumen iDEB sintetis (struktur mengikuti file .txt hasil SLIK) untuk benchmark & uji beban.
+# Contoh: python benchmarks/synthetic.py -o /tmp/ideb --files 25 --facilities 300
+
+BANKS = [
+    "PT BANK RAKYAT INDONESIA (PERSERO) TBK", "PT BANK MANDIRI (PERSERO) TBK", "PT BANK NEGARA INDONESIA (PERSERO) TBK",
+    "PT BANK CENTRAL ASIA TBK", "PT BANK TABUNGAN NEGARA (PERSERO) TBK", "PT BANK SYARIAH INDONESIA TBK",
+    "PT BANK PEMBANGUNAN DAERAH JAWA BARAT DAN BANTEN TBK", "PT BANK CIMB NIAGA TBK", "PT BPR ARTHA SEJAHTERA",
+    "PT ADIRA DINAMIKA MULTI FINANCE TBK", "PT FEDERAL INTERNATIONAL FINANCE",
+]
+JENIS_KREDIT = ["Kredit Modal Kerja", "Kredit Investasi", "Kredit Pemilikan Rumah", "Kredit Kendaraan Bermotor",
+                "Kartu Kredit", "Kredit atau Pembiayaan untuk Konsumsi Lainnya"]
+PENGGUNAAN = ["Modal Kerja", "Investasi", "Konsumsi"]
+KONDISI = ["Fasilitas Aktif", "Fasilitas Aktif", "Fasilitas Aktif", "Lunas", "Dihapusbukukan"]
+KOTA = ["JAKARTA", "BANDUNG", "SURABAYA", "MEDAN", "SEMARANG", "MAKASSAR", "DENPASAR"]
+NAMA_DEPAN = ["BUDI", "SITI", "AGUS", "DEWI", "RUDI", "RINA", "HENDRA", "YUSUF", "MARIA", "ANDI"]
+NAMA_BELAKANG = ["SANTOSO", "LESTARI", "WIJAYA", "HASIBUAN", "NASUTION", "PRATAMA", "KURNIAWAN", "SIREGAR"]
+# Kolektabilitas: sebagian besar lancar, sesekali memburuk
+KOL_WEIGHTS = [("1", 86), ("2", 8), ("3", 3), ("4", 1), ("5", 2)]
+
+def _kol(rnd):
+    return rnd.choices([k for k, _ in KOL_WEIGHTS], weights=[w for _, w in KOL_WEIGHTS])[0]
+
+def _ymd(d):
+    return d.strftime("%Y%m%d")
+
+def _month_back(year, month, k):
+    m = year * 12 + (month - 1) - k
+    return m // 12, m % 12 + 1
+
+def make_facility(rnd, posisi, months=24):
+    plafon = rnd.choice([5, 10, 25, 50, 100, 250, 500, 1000, 5000]) * 1_000_000 * rnd.randint(1, 9)
+    baki = int(plafon * rnd.random())
+    mulai = date(rnd.randint(2015, posisi[0]), rnd.randint(1, 12), rnd.randint(1, 28))
+    tempo = date(mulai.year + rnd.randint(1, 15), mulai.month, mulai.day)
+    jenis = rnd.choice(JENIS_KREDIT)
+    f = {
+        "ljk": f"{rnd.randint(1, 999):03d}", "ljkKet": rnd.choice(BANKS), "cabang": f"{rnd.randint(1, 9999):04d}",
+        "noRekening": str(rnd.randint(10 ** 11, 10 ** 12 - 1)), "sifatKreditPembiayaanKet": "Kredit yang Bukan Restrukturisasi",
+        "jenisKreditPembiayaan": f"{JENIS_KREDIT.index(jenis) + 10:02d}", "jenisKreditPembiayaanKet": jenis,
+        "jenisPenggunaanKet": rnd.choice(PENGGUNAAN), "sektorEkonomiKet": "Rumah Tangga",
+        "plafonAwal": str(plafon), "plafon": str(plafon), "nilaiProyek": rnd.choice(["0", "", str(int(plafon * 1.2))]),
+        "bakiDebet": str(baki), "tunggakanPokok": "0", "tunggakanBunga": "0",
+        "sukuBungaImbalan": f"{rnd.choice([6.5, 8.75, 9.5, 11, 12.5, 24]):g}", "jenisSukuBungaImbalanKet": "Fixed",
+        "tanggalMulai": _ymd(mulai), "tanggalJatuhTempo": _ymd(tempo), "tanggalAkadAwal": _ymd(mulai),
+        "tanggalRestrukturisasiAkhir": _ymd(mulai) if rnd.random() < 0.05 else "",
+        "kualitas": _kol(rnd), "jumlahHariTunggakan": "0", "kondisiKet": rnd.choice(KONDISI),
+        "tanggalUpdate": f"{posisi[0]}{posisi[1]:02d}15093000",
+    }
+    for j in range(1, 25):
+        y, m = _month_back(posisi[0], posisi[1], j - 1)
+        f[f"tahunBulan{j:02d}"] = f"{y}{m:02d}" if j <= months else ""
+        f[f"tahunBulan{j:02d}Kol"] = _kol(rnd) if j <= months else ""
+        f[f"tahunBulan{j:02d}Ht"] = "0" if j <= months else ""
+    return f
+
+def generate_ideb(facilities=50, months=24, seed=0, nik=None, posisi=(2025, 2)):
+    rnd = random.Random(seed)
+    fas = [make_facility(rnd, posisi, months) for _ in range(facilities)]
+    # Fasilitas dibagi ke beberapa jenis seperti file asli (sebagian besar kredit/pembiayaan)
+    n_kredit = int(facilities * 0.8)
+    n_garansi = (facilities - n_kredit) // 2
+    kols = [f["kualitas"] for f in fas] + [f[f"tahunBulan{j:02d}Kol"] for f in fas for j in range(1, 25)]
+    active = [f for f in fas if f["kondisiKet"] == "Fasilitas Aktif"]
+    banks = {f["ljkKet"] for f in active}
+    nama = f"{rnd.choice(NAMA_DEPAN)} {rnd.choice(NAMA_BELAKANG)}"
+    hasil = _month_back(posisi[0], posisi[1], -1)
+    return {
+        "header": {"kodeReferensiPengguna": f"REF{seed:08d}", "tanggalHasil": f"{hasil[0]}{hasil[1]:02d}05101530",
+                   "idPermintaan": str(rnd.randint(10 ** 9, 10 ** 10)), "idPenggunaPermintaan": "USR001", "kodeLJKPermintaan": "002"},
+        "individual": {
+            "nomorLaporan": f"{rnd.randint(10 ** 14, 10 ** 15)}", "posisiDataTerakhir": f"{posisi[0]}{posisi[1]:02d}",
+            "tanggalPermintaan": f"{posisi[0]}{posisi[1]:02d}28",
+            "dataPokokDebitur": [{
+                "namaDebitur": nama, "identitas": "NIK", "noIdentitas": nik or f"32{rnd.randint(10 ** 13, 10 ** 14 - 1)}",
+                "jenisKelamin": "L", "jenisKelaminKet": rnd.choice(["Laki-laki", "Perempuan"]), "npwp": f"{rnd.randint(10 ** 14, 10 ** 15 - 1)}",
+                "tempatLahir": rnd.choice(KOTA).title(), "tanggalLahir": f"19{rnd.randint(60, 99)}{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}",
+                "alamat": f"JL. MERDEKA NO. {rnd.randint(1, 200)} RT {rnd.randint(1, 20):03d} RW {rnd.randint(1, 15):03d}",
+                "kelurahan": "SUKAMAJU", "kecamatan": "CIBEUNYING", "kabKotaKet": rnd.choice(KOTA), "pekerjaanKet": rnd.choice(["Wiraswasta", "Pegawai Swasta", "PNS", "Lainnya"]),
+                "ljkKet": rnd.choice(BANKS), "tanggalUpdate": f"{posisi[0]}{posisi[1]:02d}15093000",
+            }],
+            "ringkasanFasilitas": {
+                "plafonEfektifKreditPembiayaan": str(sum(int(f["plafon"]) for f in active)),
+                "plafonEfektifTotal": str(sum(int(f["plafon"]) for f in active)),
+                "bakiDebetTotal": str(sum(int(f["bakiDebet"]) for f in active)),
+                "krediturBankUmum": str(sum(1 for b in banks if b.startswith("PT BANK"))),
+                "krediturBPR/S": str(sum(1 for b in banks if "BPR" in b)),
+                "krediturLp": str(sum(1 for b in banks if not b.startswith("PT BANK") and "BPR" not in b)),
+                "krediturLainnya": "0",
+                "kualitasTerburuk": max(k for k in kols if k) if fas else "-",
+                "kualitasBulanDataTerburuk": f"{posisi[0]}{posisi[1]:02d}",
+            },
+            "fasilitas": {
+                "kreditPembiayan": fas[:n_kredit], "lc": [], "garansiYgDiberikan": fas[n_kredit:n_kredit + n_garansi],
+                "suratBerharga": [], "fasilitasLain": fas[n_kredit + n_garansi:],
+            },
+        },
+    }
+
+def generate_bytes(facilities=50, months=24, seed=0, nik=None, indent=None):
+    return json.dumps(generate_ideb(facilities, months, seed, nik), indent=indent).encode("utf-8")
+
+def facility_list(doc):
+    return [f for v in doc["individual"]["fasilitas"].values() if isinstance(v, list) for f in v]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Buat file iDEB sintetis")
+    ap.add_argument("-o", "--out", required=True, help="Direktori output")
+    ap.add_argument("--files", type=int, default=10)
+    ap.add_argument("--facilities", type=int, default=50, help="Jumlah fasilitas per debitur")
+    ap.add_argument("--months", type=int, default=24, help="Panjang histori kolektabilitas (maks 24)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--indent", type=int, default=None, help="Indentasi JSON (file asli biasanya tanpa indentasi)")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    for i in range(args.files):
+        path = os.path.join(args.out, f"ideb_{args.seed + i:05d}.txt")
+        with open(path, "wb") as fh: fh.write(generate_bytes(args.facilities, min(args.months, 24), args.seed + i, indent=args.indent))
+    print(f"{args.files} file ditulis ke {args.out}")
+
+if __name__ == "__main__":
+    main()
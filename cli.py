@@ -0,0 +1,142 @@
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+import diagnostics
+from exporters import EXPORTERS, build_report
+from ideb import SLIK_FORMATS, parse_ideb_file
+from store import open_store
+
+MANIFEST_NAME = ".brislik_manifest.jsonl"
+SUMMARY_COLS = ["file", "file_hash", "nik", "nama", "skor", "plafon", "baki", "util", "total_kred", "posisi", "status", "error"]
+
+def collect_files(source):
+    # Terima direktori (semua .txt di dalamnya, rekursif) atau pola glob
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "**", "*.txt"), recursive=True)
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p))
+
+def safe_filename(text):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(text)).strip("_") or "DEBITUR"
+
+def file_stamp(path):
+    st_ = os.stat(path)
+    return f"{st_.st_size}:{st_.st_mtime_ns}"
+
+def process_file(path, out_dir, formats, sel_format, store_path=None):
+    # Dijalankan di proses worker: setiap kegagalan dikembalikan sebagai record, tidak menghentikan batch
+    rec = {"file": path, "file_hash": None, "stamp": file_stamp(path), "status": "ok", "error": ""}
+    try:
+        with diagnostics.stage("parse", file=path): parsed = parse_ideb_file(path)
+        rec["file_hash"] = parsed.file_hash
+        if store_path: open_store(store_path).save(parsed)
+        ident, summ = parsed.identity, parsed.summary
+        rec.update({"nik": ident.nik, "nama": ident.nama, "skor": summ.skor, "plafon": summ.plafon, "baki": summ.baki,
+                    "util": round(summ.util, 2), "total_kred": summ.total_kred, "posisi": summ.posisi})
+        base = f"Audit_{safe_filename(ident.nama)}_{rec['file_hash'][:8]}"
+        for kind in formats:
+            with open(os.path.join(out_dir, f"{base}.{kind}"), "wb") as fh, diagnostics.stage("report", file=path):
+                fh.write(build_report(parsed, sel_format, {}, kind))
+    except Exception as e:
+        rec["status"], rec["error"] = "error", f"{type(e).__name__}: {e}"
+    return rec
+
+def load_manifest(manifest_path):
+    done = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line: continue
+                try: rec = json.loads(line)
+                except ValueError: continue  # baris terpotong karena proses sebelumnya dihentikan
+                done[rec["file"]] = rec
+    return done
+
+PARQUET_ENGINES = ("pyarrow", "fastparquet")
+
+def check_summary_path(summary_path):
+    # Dicek sebelum batch dimulai, bukan baru gagal saat menulis ringkasan setelah semua file diproses
+    if summary_path and summary_path.lower().endswith(".parquet") and not any(importlib.util.find_spec(m) for m in PARQUET_ENGINES):
+        raise RuntimeError("ringkasan .parquet membutuhkan pyarrow atau fastparquet (python -m pip install pyarrow), atau gunakan .csv")
+
+def write_summary(records, summary_path):
+    df = pd.DataFrame(records, columns=SUMMARY_COLS)
+    df["total_kred"] = df["total_kred"].astype("Int64")
+    if summary_path.lower().endswith(".parquet"): df.to_parquet(summary_path, index=False)
+    else: df.to_csv(summary_path, index=False)
+
+def run_batch(source, out_dir, formats=("xlsx", "docx", "pdf"), sel_format=SLIK_FORMATS[0], workers=None, summary_path=None, resume=True, log=print,
+              store_path=None):
+    check_summary_path(summary_path)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    done = load_manifest(manifest_path) if resume else {}
+    files = collect_files(source)
+    # File yang sudah sukses (dan belum berubah) di run sebelumnya dilewati; yang gagal dicoba ulang
+    todo = [p for p in files if done.get(p, {}).get("status") != "ok" or done[p].get("stamp") != file_stamp(p)]
+    log(f"{len(files)} file ditemukan, {len(files) - len(todo)} sudah diproses, {len(todo)} akan diproses")
+
+    start = time.perf_counter()
+    n_ok = n_err = 0
+    with open(manifest_path, "a" if resume else "w", encoding="utf-8") as manifest, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_file, p, out_dir, tuple(formats), sel_format, store_path): p for p in todo}
+        for fut in as_completed(futures):
+            try: rec = fut.result()
+            except Exception as e:
+                # Worker mati mendadak (mis. kehabisan memori): file dicatat gagal dan dicoba ulang pada run berikutnya
+                msg = "proses worker berhenti mendadak" if isinstance(e, BrokenProcessPool) else f"{type(e).__name__}: {e}"
+                p = futures[fut]
+                rec = {"file": p, "file_hash": None, "stamp": file_stamp(p), "status": "error", "error": msg}
+            done[rec["file"]] = rec
+            manifest.write(json.dumps(rec, default=str) + "\n"); manifest.flush()
+            if rec["status"] == "ok": n_ok += 1
+            else:
+                n_err += 1
+                log(f"GAGAL {rec['file']}: {rec['error']}")
+    elapsed = time.perf_counter() - start
+
+    summary_path = summary_path or os.path.join(out_dir, "summary.csv")
+    write_summary([done[p] for p in files if p in done], summary_path)
+    rate = len(todo) / elapsed if elapsed > 0 else 0.0
+    log(f"Selesai: {n_ok} sukses, {n_err} gagal dalam {elapsed:.2f} detik ({rate:.1f} file/detik). Ringkasan: {summary_path}")
+    return {"files": len(files), "processed": len(todo), "ok": n_ok, "error": n_err, "seconds": elapsed, "files_per_sec": rate}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="BRISLIK batch: proses banyak file .txt iDEB sekaligus")
+    ap.add_argument("source", help="Direktori berisi file .txt iDEB atau pola glob (mis. 'dump/*.txt')")
+    ap.add_argument("-o", "--out", default="brislik_output", help="Direktori output laporan")
+    ap.add_argument("-f", "--formats", default="xlsx,docx,pdf", help="Jenis laporan, dipisah koma (xlsx,docx,pdf)")
+    ap.add_argument("-s", "--slik", type=int, choices=[1, 2, 3], default=1, help="Format tabel slik 1/2/3")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="Jumlah proses worker (default: jumlah CPU)")
+    ap.add_argument("--summary", default=None, help="Path ringkasan .csv atau .parquet (default: <out>/summary.csv)")
+    ap.add_argument("--no-resume", action="store_true", help="Abaikan manifest dan proses ulang semua file")
+    ap.add_argument("--store", default=None, help="Simpan ringkasan & fasilitas tiap file ke database SQLite ini (lihat store.py)")
+    ap.add_argument("--diagnostics", action="store_true", help="Catat waktu & puncak memori tiap tahap sebagai baris log JSON di stderr")
+    args = ap.parse_args(argv)
+
+    if args.diagnostics:
+        # Lewat env agar proses worker ikut aktif saat mengimpor modul diagnostics
+        os.environ[diagnostics.ENV_FLAG] = "1"; diagnostics.enable(True)
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    bad = [f for f in formats if f not in EXPORTERS]
+    if bad: ap.error(f"format tidak dikenal: {', '.join(bad)}")
+    try: check_summary_path(args.summary)
+    except RuntimeError as e: ap.error(str(e))
+    stats = run_batch(args.source, args.out, formats, SLIK_FORMATS[args.slik - 1], args.workers, args.summary, not args.no_resume, store_path=args.store)
+    return 1 if stats["error"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
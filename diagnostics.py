@@ -0,0 +1,150 @@
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass
+
+# Instrumentasi per tahap (waktu & puncak memori) untuk parsing, tampilan, dan ekspor.
+# Saat nonaktif stage() hanya mengembalikan context manager kosong yang sama, tanpa pencatatan apa pun.
+# Aktifkan lewat toggle di sidebar, `cli.py --diagnostics`, atau env BRISLIK_DIAGNOSTICS=1.
+# Status aktif & tracemalloc berlaku untuk seluruh proses; catatan diberi id sesi agar panel hanya menampilkan sesi sendiri.
+# Puncak memori tracemalloc hanya satu untuk seluruh proses, jadi hanya diukur selama tidak ada thread lain yang
+# sedang berada di dalam stage; tahap yang tumpang tindih dengan thread lain dicatat dengan peak_bytes=None.
+
+logger = logging.getLogger("brislik.diagnostics")
+MAX_RECORDS = 500
+ENV_FLAG = "BRISLIK_DIAGNOSTICS"
+
+@dataclass(frozen=True)
+class StageRecord:
+    stage: str
+    file: str
+    seconds: float
+    peak_bytes: int | None
+    depth: int
+    ok: bool
+    ts: float
+    session: str | None = None
+
+    def as_dict(self):
+        out = asdict(self)
+        out["seconds"] = round(self.seconds, 6)
+        return out
+
+_enabled = False
+_owns_tracemalloc = False
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local()
+_NULL = contextlib.nullcontext()
+_session_resolver = None
+_active_threads = 0  # jumlah thread yang sedang berada di dalam stage
+_overlaps = 0  # bertambah setiap kali stage dibuka saat thread lain juga berada di dalam stage
+
+class _Stage:
+    # Puncak memori tracemalloc bersifat global, jadi puncak tahap anak diteruskan ke induknya sebelum di-reset
+    __slots__ = ("name", "file", "session", "start", "base", "peak", "measured", "overlaps")
+
+    def __init__(self, name, file, session):
+        self.name, self.file, self.session = name, file, session
+        self.base = self.peak = 0
+        self.measured = False
+
+    def __enter__(self):
+        global _active_threads, _overlaps
+        stack = getattr(_local, "stack", None)
+        if stack is None: stack = _local.stack = []
+        if stack:
+            if self.file is None: self.file = stack[-1].file
+            if self.session is None: self.session = stack[-1].session
+        elif self.session is None and _session_resolver is not None: self.session = _session_resolver()
+        with _lock:
+            if not stack: _active_threads += 1
+            if _active_threads > 1: _overlaps += 1
+            self.overlaps = _overlaps
+            # reset_peak() hanya aman bila tidak ada stage thread lain yang puncaknya ikut terhapus
+            if _active_threads == 1 and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                if stack: stack[-1].peak = max(stack[-1].peak, peak)
+                tracemalloc.reset_peak()
+                self.base = self.peak = current
+                self.measured = True
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active_threads
+        seconds = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        peak_bytes = None
+        with _lock:
+            if self.measured and self.overlaps == _overlaps and tracemalloc.is_tracing():
+                peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+                peak_bytes = max(peak - self.base, 0)
+                if stack: stack[-1].peak = max(stack[-1].peak, peak)
+                tracemalloc.reset_peak()
+            if not stack: _active_threads -= 1
+        _record(StageRecord(self.name, self.file or "-", seconds, peak_bytes, len(stack), exc_type is None, time.time(), self.session))
+        return False
+
+def _record(rec):
+    with _lock: _records.append(rec)
+    # Satu baris JSON per tahap agar mudah diambil agregator log
+    logger.info(json.dumps({"event": "stage", **rec.as_dict()}, ensure_ascii=False))
+
+def _ensure_handler():
+    if logger.handlers: return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def is_enabled():
+    return _enabled
+
+def enable(on=True, memory=True):
+    # memory=False hanya mencatat waktu (tracemalloc memperlambat alokasi Python selama aktif)
+    global _enabled, _owns_tracemalloc
+    with _lock:
+        if on:
+            _ensure_handler()
+            if memory and not tracemalloc.is_tracing():
+                tracemalloc.start(); _owns_tracemalloc = True
+        if (not on or not memory) and _owns_tracemalloc:
+            tracemalloc.stop(); _owns_tracemalloc = False
+        _enabled = on
+
+def set_session_resolver(fn):
+    # fn() -> id sesi pemanggil (atau None); dipasang app.py agar catatan bisa dipisah per sesi Streamlit
+    global _session_resolver
+    _session_resolver = fn
+
+def current_session():
+    return None if _session_resolver is None else _session_resolver()
+
+def stage(name, file=None, session=None):
+    # file/session=None: ikut tahap induk di thread yang sama (atau id sesi dari resolver untuk tahap teratas).
+    # Thread pool & callback unduhan tidak punya konteks sesi, jadi pemanggil meneruskan current_session() sendiri.
+    if not _enabled: return _NULL
+    return _Stage(name, file, session)
+
+def records(session=None):
+    # session=None: semua catatan (CLI); selain itu hanya catatan milik sesi tersebut
+    with _lock: return [r.as_dict() for r in _records if session is None or r.session == session]
+
+def clear(session=None):
+    with _lock:
+        if session is None: _records.clear()
+        else:
+            keep = [r for r in _records if r.session != session]
+            _records.clear(); _records.extend(keep)
+
+if os.environ.get(ENV_FLAG, "").strip().lower() in ("1", "true", "yes", "on"): enable(True)
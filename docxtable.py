@@ -0,0 +1,43 @@
+import re
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from ideb import safe_text
+
+# Pembuat tabel Word massal: XML <w:tbl> dirangkai sekali dari array kolom lalu di-parse satu kali,
+# menggantikan table.add_row()/cell.text yang menelusuri pohon XML untuk setiap sel.
+
+_INVALID_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def _column_texts(series):
+    # safe_text cukup dijalankan sekali per nilai unik, lalu di-escape untuk XML
+    s = series.astype(object)
+    mapping = {v: escape(_INVALID_XML.sub("", safe_text(v))) for v in pd.unique(s)}
+    return [mapping[v] for v in s]
+
+def _row_xml(texts, header=False):
+    tr_pr = "<w:trPr><w:tblHeader/></w:trPr>" if header else ""
+    cells = "".join(f'<w:tc><w:p><w:r><w:t xml:space="preserve">{t}</w:t></w:r></w:p></w:tc>' for t in texts)
+    return f"<w:tr>{tr_pr}{cells}</w:tr>"
+
+def build_table_xml(df, style="TableGrid"):
+    parts = [f'<w:tbl {nsdecls("w")}><w:tblPr><w:tblStyle w:val="{style}"/><w:tblW w:w="0" w:type="auto"/>'
+             '<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="1" w:lastColumn="0" w:noHBand="0" w:noVBand="1"/></w:tblPr>',
+             "<w:tblGrid>" + "<w:gridCol/>" * len(df.columns) + "</w:tblGrid>",
+             # Baris header diulang otomatis oleh Word di setiap halaman
+             _row_xml([escape(_INVALID_XML.sub("", str(c))) for c in df.columns], header=True)]
+    columns = [_column_texts(df[c]) for c in df.columns]
+    parts.extend(_row_xml(row) for row in zip(*columns))
+    parts.append("</w:tbl>")
+    return "".join(parts)
+
+def add_table(doc, df, style="TableGrid"):
+    tbl = parse_xml(build_table_xml(df, style))
+    # Tabel disisipkan sebelum sectPr agar pengaturan halaman tetap menjadi elemen terakhir body
+    body = doc.element.body
+    if body.sectPr is not None: body.sectPr.addprevious(tbl)
+    else: body.append(tbl)
+    return tbl
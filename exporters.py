@@ -0,0 +1,266 @@
+import io
+import multiprocessing
+import os
+import re
+import tempfile
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from diagnostics import current_session, stage
+from ideb import SLIK_FORMATS, LRUCache, apply_filters, apply_slik_format, safe_text, to_float
+from pdftable import render_table
+
+# Import library pendukung
+try:
+    from docx import Document
+    from docx.enum.section import WD_ORIENTATION
+    from docx.shared import Inches, Pt
+    from fpdf import FPDF
+
+    from docxtable import add_table
+    HAS_DOC_LIBS = True
+except ImportError:
+    HAS_DOC_LIBS = False
+
+# openpyxl dijaga terpisah: tanpa pustaka Word/PDF ekspor Excel tetap jalan, dan sebaliknya
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    _THIN = Side(style="thin")
+    _HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+    HAS_EXCEL_LIB = True
+except ImportError:
+    HAS_EXCEL_LIB = False
+
+MISSING_LIBS_MSG = "Pustaka pendukung ekspor Word/PDF/Excel belum terinstal. Jalankan: python -m pip install python-docx fpdf2 openpyxl"
+
+# --- FUNGSI EKSPOR ---
+# Format string dari OpenPyXL yang memberitahu Excel untuk menampilkan "Rp " di depan number
+RP_FORMAT = '"Rp "#,##0'
+KOLOM_UANG = ("PLAFON", "BAKI DEBET", "OS (Rp)", "Plafon Awal", "OS")
+EXCEL_CHUNK_ROWS = 5000  # baris dikonversi per potongan agar memori tetap datar
+
+def _summary_rows(id_info, aud_info):
+    # (label, nilai, format angka); nominal dikonversi ke integer mentah agar bisa di SUM oleh Excel
+    return [
+        ("IDENTITAS DEBITUR", None, None),
+        ("Nama Lengkap", id_info['nama'], None), ("NIK", id_info['nik'], None),
+        ("Tempat/Tgl Lahir", f"{id_info['tmpt_lahir']}, {id_info['tgl_lahir']}", None),
+        ("Jenis Kelamin", id_info['jk'], None), ("NPWP", id_info['npwp'], None),
+        ("Pekerjaan", id_info['pekerjaan'], None), ("Alamat", id_info['alamat'], None),
+        (None, None, None),
+        ("SUMMARY AUDIT", None, None),
+        ("Skor Terburuk", f"Kolektabilitas {aud_info['skor']}", None),
+        ("Total Plafon", int(to_float(aud_info['plafon'])), RP_FORMAT), ("Total Kewajiban", int(to_float(aud_info['baki'])), RP_FORMAT),
+        ("Utilisasi", aud_info['util'], None), ("Kreditur", f"{aud_info['total_kred']} Lembaga", None),
+        ("Posisi Data", aud_info['posisi'], None), ("Tanggal Laporan", id_info['tgl'], None),
+        (None, None, None),
+    ]
+
+class _SheetWriter:
+    # Menulis ke worksheet write-only openpyxl: baris dialirkan ke file sementara, bukan disimpan sebagai pohon objek
+    def __init__(self, ws):
+        self.ws = ws
+
+    def cell(self, value, number_format=None, bold=False):
+        c = WriteOnlyCell(self.ws, value)
+        if number_format: c.number_format = number_format
+        if bold:
+            c.font = Font(bold=True); c.border = _HEADER_BORDER; c.alignment = Alignment(horizontal="center")
+        return c
+
+    def append(self, row):
+        self.ws.append(row)
+
+    def write_table(self, df):
+        if df.empty: return
+        self.append([self.cell(c, bold=True) for c in df.columns])
+        # Format Rupiah ditentukan sekali per kolom, bukan dicari ulang per sel
+        money = [i for i, c in enumerate(df.columns) if c in KOLOM_UANG]
+        for start in range(0, len(df), EXCEL_CHUNK_ROWS):
+            block = df.iloc[start:start + EXCEL_CHUNK_ROWS]
+            cols = []
+            for i, c in enumerate(block.columns):
+                s = block[c]
+                if i in money and not pd.api.types.is_numeric_dtype(s):
+                    s = s.map(lambda x: int(to_float(x)))  # Mengubah value ke number agar fungsi SUM di Excel aktif
+                cols.append(s.astype(object).where(s.notna(), None).tolist())
+            for row in zip(*cols):
+                row = list(row)
+                for i in money: row[i] = self.cell(row[i], RP_FORMAT)
+                self.append(row)
+
+def _write_audit_sheet(wb, title, id_info, aud_info, df):
+    w = _SheetWriter(wb.create_sheet(title))
+    # Letak ringkasan dihitung dari daftar baris, tidak lagi memakai nomor baris tetap
+    for label, value, fmt in _summary_rows(id_info, aud_info):
+        w.append([label, w.cell(value, fmt) if fmt else value])
+    w.write_table(df)
+
+def _sheet_title(name, used):
+    title = re.sub(r"[\[\]:*?/\\]", "_", str(name))[:31] or "Sheet"
+    base, k = title, 2
+    while title.lower() in used:
+        suffix = f" ({k})"; title = base[:31 - len(suffix)] + suffix; k += 1
+    used.add(title.lower())
+    return title
+
+def _require_openpyxl():
+    if not HAS_EXCEL_LIB: raise ImportError(MISSING_LIBS_MSG)
+
+def export_excel(id_info, aud_info, df):
+    _require_openpyxl()
+    wb = Workbook(write_only=True)
+    _write_audit_sheet(wb, 'Audit', id_info, aud_info, df)
+    output = io.BytesIO(); wb.save(output)
+    return output.getvalue()
+
+def export_excel_multi(reports, merged_frames=None):
+    # reports: list (nama sheet, id_info, aud_info, df). Satu sheet per debitur + sheet gabungan seluruh fasilitas
+    # merged_frames: tabel per debitur (urutan sama dengan reports) untuk sheet Gabungan. Format slik tiap debitur bisa
+    # berbeda, jadi pemanggil sebaiknya memberi satu tata letak kolom yang sama; default memakai df masing-masing sheet
+    _require_openpyxl()
+    wb = Workbook(write_only=True)
+    used = {"gabungan"}
+    for name, id_info, aud_info, df in reports:
+        _write_audit_sheet(wb, _sheet_title(name, used), id_info, aud_info, df)
+    if merged_frames is None: merged_frames = [df for _, _, _, df in reports]
+    frames = [df.drop(columns=["NO"], errors="ignore").assign(NIK=id_info['nik'], NAMA=id_info['nama'])
+              for (_, id_info, _, _), df in zip(reports, merged_frames) if not df.empty]
+    w = _SheetWriter(wb.create_sheet("Gabungan"))
+    if frames:
+        merged = pd.concat(frames, ignore_index=True)
+        lead = ["NIK", "NAMA"]
+        merged = merged[lead + [c for c in merged.columns if c not in lead]]
+        merged.insert(0, "NO", range(1, len(merged) + 1))
+        w.write_table(merged)
+    output = io.BytesIO(); wb.save(output)
+    return output.getvalue()
+
+def export_word(id_info, aud_info, df):
+    doc = Document(); section = doc.sections[-1]; section.orientation = WD_ORIENTATION.LANDSCAPE
+    doc.add_heading('LAPORAN REKAPITULASI & AUDIT BRISLIK', 0)
+    doc.add_heading('IDENTITAS DEBITUR', level=1)
+    doc.add_paragraph(f"Nama: {id_info['nama']}\nNIK: {id_info['nik']}\nTTL: {id_info['tmpt_lahir']}, {id_info['tgl_lahir']}\nJK: {id_info['jk']} | NPWP: {id_info['npwp']}\nPekerjaan: {id_info['pekerjaan']}\nAlamat: {id_info['alamat']}")
+    doc.add_heading('SUMMARY AUDIT', level=1)
+    doc.add_paragraph(f"Skor: Kolektabilitas {aud_info['skor']}\nTotal Plafon: {aud_info['plafon']}\nTotal Kewajiban: {aud_info['baki']}\nUtilisasi: {aud_info['util']} | Kreditur: {aud_info['total_kred']} Lembaga\nPosisi Data: {aud_info['posisi']}")
+    # Tabel dibangun sekaligus dari XML, nilai ditulis utuh tanpa dipotong
+    if not df.empty: add_table(doc, df, style=doc.styles['Table Grid'].style_id)
+    out = io.BytesIO(); doc.save(out); return out.getvalue()
+
+def export_pdf(id_info, aud_info, df):
+    pdf = FPDF('L', 'mm', 'A4'); pdf.add_page(); pdf.set_font("Helvetica", 'B', 16)
+    pdf.cell(0, 10, f"LAPORAN AUDIT: {id_info['nama']}", ln=True, align='C'); pdf.ln(4)
+    pdf.set_font("Helvetica", 'B', 9); pdf.cell(0, 6, "IDENTITAS DEBITUR", ln=True)
+    pdf.set_font("Helvetica", size=8)
+    pdf.cell(0, 5, safe_text(f"Nama: {id_info['nama']} | NIK: {id_info['nik']} | TTL: {id_info['tmpt_lahir']}, {id_info['tgl_lahir']}"), ln=True)
+    pdf.cell(0, 5, safe_text(f"Pekerjaan: {id_info['pekerjaan']} | NPWP: {id_info['npwp']} | JK: {id_info['jk']}"), ln=True)
+    pdf.ln(3); pdf.set_font("Helvetica", 'B', 9); pdf.cell(0, 6, "SUMMARY AUDIT", ln=True)
+    pdf.set_font("Helvetica", size=8)
+    pdf.cell(0, 5, safe_text(f"Skor: Kol {aud_info['skor']} | Plafon: {aud_info['plafon']} | Kewajiban: {aud_info['baki']}"), ln=True)
+    pdf.cell(0, 5, safe_text(f"Utilisasi: {aud_info['util']} | Kreditur: {aud_info['total_kred']} Lembaga | Posisi: {aud_info['posisi']}"), ln=True)
+    pdf.ln(5)
+    
+    # Kolom 2-4 (nama bank/jenis) rata kiri seperti sebelumnya, sisanya rata tengah
+    render_table(pdf, df, align={c: "L" for c in df.columns[1:4]})
+    return bytes(pdf.output())
+
+EXPORTERS = {"xlsx": export_excel, "docx": export_word, "pdf": export_pdf}
+FILTER_FIELDS = ("bank", "jenis_penggunaan", "jenis", "kondisi")
+
+# --- CACHE LAPORAN ---
+_report_cache = LRUCache(max_entries=96)
+
+def filters_key(filters):
+    # Urutan pilihan multiselect tidak mengubah isi laporan, jadi dinormalisasi sebelum dijadikan kunci
+    filters = filters or {}
+    return tuple((k, tuple(sorted(filters.get(k) or ()))) for k in FILTER_FIELDS)
+
+def report_frame(parsed, sel_format, filters, keep_money=False):
+    if parsed.facilities.empty: return pd.DataFrame()
+    return apply_slik_format(apply_filters(parsed.facilities, **(filters or {})), sel_format, keep_money=keep_money)
+
+def build_report(parsed, sel_format, filters, kind):
+    # Excel menerima nominal sebagai integer native; Word/PDF menerima teks yang sudah diformat
+    with stage("report_frame"): df_final = report_frame(parsed, sel_format, filters, keep_money=(kind == "xlsx"))
+    with stage(f"export_{kind}"): return EXPORTERS[kind](parsed.identity.as_dict(), parsed.summary.as_dict(), df_final)
+
+def get_report(parsed, sel_format, filters, kind):
+    key = (parsed.file_hash, sel_format, filters_key(filters), kind)
+    return _report_cache.get_or_build(key, lambda: build_report(parsed, sel_format, filters, kind))
+
+def lazy_report(parsed, sel_format, filters, kind, label=None):
+    # Dipasang sebagai `data` st.download_button: laporan baru dibuat saat tombol diklik
+    # label: nama file unggahan untuk catatan diagnostik (callback berjalan di luar konteks dashboard)
+    filters = {k: list(v) for k, v in (filters or {}).items()}
+    session = current_session()
+    def _build():
+        with stage(f"download_{kind}", file=label, session=session): return get_report(parsed, sel_format, filters, kind)
+    return _build
+
+# --- EKSPOR MASSAL (ZIP) ---
+ZIP_SPOOL_LIMIT = 64 * 1024 * 1024  # di atas ukuran ini arsip ZIP dipindah ke file sementara di disk
+# Process pool (spawn) baru sepadan bila total baris laporan cukup besar: tiap worker mengimpor ulang pandas/openpyxl/docx/fpdf
+# dan setiap ParsedIdeb di-pickle. Di bawah batas ini thread pool lebih cepat.
+PROCESS_POOL_MIN_ROWS = 20000
+
+def want_processes(jobs, kinds):
+    if (os.cpu_count() or 1) < 2: return False
+    return sum(len(parsed.facilities) for _, _, parsed, _, _ in jobs) * len(kinds) >= PROCESS_POOL_MIN_ROWS
+
+def _done_future(value):
+    fut = Future()
+    fut.set_result(value)
+    return fut
+
+def _labelled(label, session, fn, *args):
+    # Thread pool tidak mewarisi konteks diagnostik pemanggil, jadi nama file & sesi diberikan ulang
+    with stage("zip_report", file=label, session=session): return fn(*args)
+
+def build_zip(jobs, kinds=("xlsx", "docx", "pdf"), workers=None, on_progress=None, processes=None, combined=True):
+    # processes=None: dipilih otomatis lewat want_processes()
+    # jobs: list (folder, nama file laporan, ParsedIdeb, format slik, filter)
+    # Setiap laporan dibuat paralel (thread pool, atau process pool bila `processes`), lalu langsung ditulis ke ZIP oleh thread pemanggil
+    spool = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_LIMIT)
+    tasks = [(folder, base, parsed, sel_format, filters, kind) for folder, base, parsed, sel_format, filters in jobs for kind in kinds]
+    errors = []
+    if processes is None: processes = want_processes(jobs, kinds)
+    if processes:
+        # spawn: proses Streamlit punya banyak thread sehingga fork tidak aman
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with zipfile.ZipFile(spool, "w", zipfile.ZIP_DEFLATED) as zf, pool:
+        futures = {}
+        session = current_session()
+        for folder, base, parsed, sel_format, filters, kind in tasks:
+            key = (parsed.file_hash, sel_format, filters_key(filters), kind)
+            if not processes: fut = pool.submit(_labelled, folder, session, get_report, parsed, sel_format, filters, kind)
+            elif key in _report_cache: fut = _done_future(get_report(parsed, sel_format, filters, kind))
+            else: fut = pool.submit(build_report, parsed, sel_format, filters, kind)
+            futures[fut] = (folder, base, kind, key)
+        for done, fut in enumerate(as_completed(futures), 1):
+            folder, base, kind, key = futures[fut]
+            arcname = f"{folder}/{base}.{kind}"
+            try:
+                data = fut.result()
+                _report_cache.get_or_build(key, lambda: data)  # hasil process pool ikut mengisi cache unduhan
+                zf.writestr(arcname, data)
+            except Exception as e: errors.append(f"{arcname}: {e}")
+            if on_progress: on_progress(done, len(tasks), arcname)
+        if combined and "xlsx" in kinds and len(jobs) > 1:
+            # Workbook gabungan: satu sheet per debitur + sheet Gabungan
+            try:
+                reports = [(parsed.identity.nama, parsed.identity.as_dict(), parsed.summary.as_dict(), report_frame(parsed, sel_format, filters, keep_money=True))
+                           for _, _, parsed, sel_format, filters in jobs]
+                # Sheet Gabungan selalu memakai tata letak slik 1 agar kolom tidak terpecah antar format
+                merged = [report_frame(parsed, SLIK_FORMATS[0], filters, keep_money=True) for _, _, parsed, _, filters in jobs]
+                zf.writestr("Semua_Debitur.xlsx", export_excel_multi(reports, merged))
+            except Exception as e: errors.append(f"Semua_Debitur.xlsx: {e}")
+        if errors: zf.writestr("ERRORS.txt", "\n".join(errors))
+    spool.seek(0)
+    return spool
@@ -0,0 +1,440 @@
+import codecs
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from diagnostics import stage
+
+SLIK_FORMATS = ["slik 1 (Default)", "slik 2 (Aldista)", "slik 3 (Egie)"]
+# Naikkan setiap kali hasil parse_identity/parse_summary/build_facility_table berubah, agar hasil lama di store.py tidak dipakai lagi
+PARSER_VERSION = 1
+
+# --- FUNGSI HELPER ---
+def to_float(val):
+    if not val or val == '-': return 0.0
+    # Angka mentah jangan dibersihkan seperti string Rupiah (titik desimal bukan pemisah ribuan)
+    if isinstance(val, (int, float)): return float(val)
+    clean_val = str(val).upper().replace('RP', '').replace('.', '').replace(' ', '').strip()
+    clean_val = clean_val.split(',')[0]
+    try: return float(clean_val)
+    except ValueError: return 0.0
+
+def format_rupiah(val):
+    if isinstance(val, str) and "Rp" in val: return val
+    try: return "Rp " + f"{int(to_float(val)):,}".replace(",", ".")
+    except: return "Rp 0"
+
+def format_date(date_str):
+    if not date_str or date_str in ["-", "null", ""]: return "-"
+    try:
+        dt = datetime.strptime(str(date_str)[:8], '%Y%m%d')
+        return dt.strftime('%d-%m-%Y')
+    except: return date_str
+
+def safe_text(text):
+    if not text: return "-"
+    return str(text).replace("✔", "V").encode('ascii', 'ignore').decode('ascii')
+
+def file_hash(raw_bytes):
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+# --- HASIL PARSING ---
+@dataclass(frozen=True)
+class DebtorIdentity:
+    nama: str
+    nik: str
+    alamat: str
+    tgl: str
+    tmpt_lahir: str
+    tgl_lahir: str
+    jk: str
+    npwp: str
+    pekerjaan: str
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+@dataclass(frozen=True)
+class AuditSummary:
+    skor: str
+    plafon: float
+    baki: float
+    total_kred: int
+    posisi: str
+
+    @property
+    def util(self):
+        return (self.baki / self.plafon * 100) if self.plafon > 0 else 0
+
+    def as_dict(self):
+        # Bentuk dict yang dipakai oleh fungsi ekspor
+        return {"skor": self.skor, "plafon": format_rupiah(self.plafon), "baki": format_rupiah(self.baki),
+                "util": f"{self.util:.2f}%", "total_kred": self.total_kred, "posisi": self.posisi}
+
+@dataclass(frozen=True)
+class ParsedIdeb:
+    file_hash: str
+    identity: DebtorIdentity
+    summary: AuditSummary
+    facilities: pd.DataFrame
+
+# --- PARSING iDEB ---
+FACILITY_KEYS = ('ljkKet', 'jenisPenggunaanKet', 'jenisKreditPembiayaanKet', 'jenisKreditKet', 'plafon', 'nilaiProyek',
+                 'bakiDebet', 'tanggalMulai', 'tanggalJatuhTempo', 'kualitas', 'sukuBungaImbalan', 'kondisiKet',
+                 'tanggalRestrukturisasiAkhir')
+KOL_KEYS = tuple(f"tahunBulan{j:02d}Kol" for j in range(1, 25))
+
+# Nama kolom internal tabel fasilitas per jenis nilai (dipakai saat format tampilan/ekspor)
+MONEY_COLS = ("PLAFON", "PLAFON_AWAL", "BAKI DEBET")
+DATE_COLS = ("TGL_MULAI", "JATUH_TEMPO")
+KOL_COLS = ("KOL_TERAKHIR", "KOL_TERBURUK")
+
+def _text(series, default='-'):
+    # Nilai kosong/null diganti default, seperti `f.get(k) or '-'`
+    return series.where(series.notna() & (series != ''), default).astype(str)
+
+def _amount(series):
+    num = pd.to_numeric(series, errors='coerce')
+    # String berformat Rupiah ("Rp 1.500.000") jatuh ke parser lama
+    odd = num.isna() & series.notna()
+    if odd.any(): num[odd] = series[odd].map(to_float)
+    return num.fillna(0)
+
+def _rate(series):
+    # Suku bunga berdesimal koma ("9,5") dibaca sebagai 9.5, bukan dianggap kosong
+    num = pd.to_numeric(series, errors='coerce')
+    odd = num.isna() & series.notna()
+    if odd.any(): num[odd] = pd.to_numeric(series[odd].astype(str).str.strip().str.replace(',', '.', regex=False), errors='coerce')
+    return num.astype(np.float64)
+
+_KOL_LOOKUP = {**{str(k): k for k in range(1, 6)}, **{k: k for k in range(1, 6)}}
+
+def _kol(frame):
+    # Matriks kolektabilitas int8 (0 = tidak ada data); nilai baku '1'..'5' dipetakan lewat lookup sekali jalan
+    flat = pd.Series(frame.to_numpy(dtype=object).ravel())
+    kol = flat.map(_KOL_LOOKUP)
+    odd = kol.isna() & flat.notna() & (flat != '')
+    if odd.any(): kol[odd] = pd.to_numeric(flat[odd].astype(str).str.strip(), errors='coerce')
+    return kol.fillna(0).to_numpy(dtype=np.int8).reshape(frame.shape)
+
+def build_facility_table(facilities):
+    # Hanya field yang dipakai yang diambil dari tiap dict, lalu seluruh tabel diolah per kolom
+    keys = FACILITY_KEYS + KOL_KEYS
+    records = [list(map(f.get, keys)) for f in facilities]
+    raw = pd.DataFrame(records, columns=keys, dtype=object)
+    n = len(raw)
+
+    kol_terakhir = _kol(raw[['kualitas']])[:, 0]
+    kol_terburuk = np.maximum(kol_terakhir, _kol(raw[list(KOL_KEYS)]).max(axis=1, initial=0))
+
+    penggunaan = raw['jenisPenggunaanKet'].fillna('').astype(str).str.lower()
+    mapped_p = np.select([penggunaan.str.contains("modal kerja", regex=False), penggunaan.str.contains("investasi", regex=False)],
+                         ["KMK", "Investasi"], "Konsumsi")
+    jenis_kredit = raw['jenisKreditPembiayaanKet']
+    original_p = _text(jenis_kredit.where(jenis_kredit.notna() & (jenis_kredit != ''), raw['jenisKreditKet']))
+
+    plafon = _amount(raw['plafon'])
+    nilai_proyek = _amount(raw['nilaiProyek'])
+    restruk = raw['tanggalRestrukturisasiAkhir']
+
+    return pd.DataFrame({
+        "NO": np.arange(1, n + 1, dtype=np.int64),
+        "NAMA JASA KEUANGAN": _text(raw['ljkKet']).str.upper(),
+        "JENIS_ORIGINAL": original_p, "JENIS_MAPPED": mapped_p,
+        "PLAFON": plafon.astype(np.int64),
+        "PLAFON_AWAL": nilai_proyek.where(nilai_proyek != 0, plafon).astype(np.int64),
+        "BAKI DEBET": _amount(raw['bakiDebet']).astype(np.int64),
+        "TGL_MULAI": pd.to_datetime(raw['tanggalMulai'].fillna('').astype(str).str[:8], format='%Y%m%d', errors='coerce'),
+        "JATUH_TEMPO": pd.to_datetime(raw['tanggalJatuhTempo'].fillna('').astype(str).str[:8], format='%Y%m%d', errors='coerce'),
+        "KOL_TERAKHIR": kol_terakhir, "KOL_TERBURUK": kol_terburuk,
+        "BUNGA": _rate(raw['sukuBungaImbalan']),
+        "KONDISI": _text(raw['kondisiKet']),
+        "RESTRUK": np.where(restruk.notna() & (restruk != ''), "Y", "N"),
+    })
+
+def parse_identity(data_pokok, header_info):
+    return DebtorIdentity(
+        nama=str(data_pokok.get('namaDebitur') or "-").upper(),
+        nik=str(data_pokok.get('noIdentitas', '-')),
+        alamat=str(data_pokok.get('alamat', '-')),
+        tgl=format_date(header_info.get('tanggalHasil')),
+        tmpt_lahir=str(data_pokok.get('tempatLahir', '-')).upper(),
+        tgl_lahir=format_date(data_pokok.get('tanggalLahir', '-')),
+        jk=str(data_pokok.get('jenisKelaminKet', '-')).upper(),
+        npwp=str(data_pokok.get('npwp', '-')),
+        pekerjaan=str(data_pokok.get('pekerjaanKet', '-')),
+    )
+
+def parse_summary(ringkasan, posisi):
+    return AuditSummary(
+        skor=ringkasan.get('kualitasTerburuk', '-'),
+        plafon=float(ringkasan.get('plafonEfektifTotal', 0)),
+        baki=float(ringkasan.get('bakiDebetTotal', 0)),
+        total_kred=sum([int(ringkasan.get(k, 0) or 0) for k in ['krediturBankUmum', 'krediturBPR/S', 'krediturLp', 'krediturLainnya']]),
+        posisi=str(posisi),
+    )
+
+# --- FORMAT TAMPILAN ---
+def rupiah_series(series):
+    # astype(object): Series kosong hasil filter tetap bertipe teks, bukan int64
+    return "Rp " + series.map(lambda v: f"{v:,}".replace(",", ".")).astype(object)
+
+def format_facilities(df, keep_money=False):
+    # Angka/tanggal native diubah menjadi teks tampilan; dilakukan hanya pada baris yang sudah difilter
+    out = df.copy()
+    if not keep_money:
+        for col in MONEY_COLS: out[col] = rupiah_series(out[col])
+    for col in DATE_COLS: out[col] = out[col].dt.strftime('%d-%m-%Y').fillna('-')
+    for col in KOL_COLS: out[col] = out[col].astype(str).where(out[col] > 0, '-')
+    out["BUNGA"] = out["BUNGA"].map(lambda v: f"{v:g} %").astype(object).where(out["BUNGA"].notna(), "- %")
+    return out
+
+def build_parsed(digest, header_info, ind, facilities):
+    data_pokok = (ind.get('dataPokokDebitur') or [{}])[0]
+    return ParsedIdeb(
+        file_hash=digest,
+        identity=parse_identity(data_pokok, header_info),
+        summary=parse_summary(ind.get('ringkasanFasilitas', {}), ind.get('posisiDataTerakhir', '-')),
+        facilities=facilities,
+    )
+
+def parse_ideb(raw_bytes, digest=None):
+    with stage("decode"): raw_content = raw_bytes.decode("utf-8-sig", errors="ignore")
+    with stage("json_loads"): data = json.loads(raw_content.strip())
+    ind = data.get('individual', {})
+
+    # Daftar fasilitas dirangkai lewat generator agar tidak ada salinan list kedua
+    fas_root = ind.get('fasilitas', {})
+    all_fas = (f for k in fas_root if isinstance(fas_root[k], list) for f in fas_root[k])
+    with stage("facility_table"): facilities = build_facility_table(all_fas)
+    return build_parsed(digest or file_hash(raw_bytes), data.get('header', {}), ind, facilities)
+
+# --- PARSING STREAMING (FILE BESAR) ---
+STREAM_THRESHOLD = 2 * 1024 * 1024  # di bawah ukuran ini json.loads biasa lebih cepat
+STREAM_CHUNK_SIZE = 64 * 1024
+INDIVIDUAL_FIELDS = ('dataPokokDebitur', 'ringkasanFasilitas', 'posisiDataTerakhir')
+
+class _HashingReader:
+    # Menghitung SHA-256 sambil membaca, jadi file tidak perlu dibaca dua kali
+    def __init__(self, fh):
+        self._fh = fh
+        self.sha = hashlib.sha256()
+
+    def read(self, size=-1):
+        chunk = self._fh.read(size)
+        self.sha.update(chunk)
+        return chunk
+
+class _JsonStream:
+    # Pembaca JSON bertahap di atas aliran byte: hanya nilai yang sedang dibaca yang ada di memori
+    _ws = ' \t\r\n'
+
+    def __init__(self, fh, chunk_size=STREAM_CHUNK_SIZE):
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='ignore')
+        self._json = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof: return False
+        if self.pos: self.buf, self.pos = self.buf[self.pos:], 0
+        chunk = self._fh.read(self._chunk_size)
+        if not chunk:
+            self.buf += self._decoder.decode(b'', final=True); self.eof = True
+        else:
+            self.buf += self._decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self._ws: self.pos += 1
+            if self.pos < len(self.buf): return self.buf[self.pos]
+            if not self._fill(): return ''
+
+    def expect(self, ch):
+        if self.peek() != ch: raise ValueError(f"Format iDEB tidak valid: diharapkan '{ch}'")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                val, end = self._json.raw_decode(self.buf, self.pos)
+                # Angka yang berhenti tepat di ujung buffer bisa jadi masih terpotong
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return val
+            except json.JSONDecodeError:
+                if self.eof: raise
+            self._fill()
+
+    def iter_object(self):
+        # Menghasilkan key satu per satu; pemanggil wajib membaca/menelusuri nilainya sebelum lanjut
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1; return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            ch = self.peek()
+            self.pos += 1
+            if ch == '}': return
+            if ch != ',': raise ValueError("Format iDEB tidak valid: diharapkan ',' atau '}'")
+
+    def iter_array(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1; return
+        while True:
+            yield self.value()
+            ch = self.peek()
+            self.pos += 1
+            if ch == ']': return
+            if ch != ',': raise ValueError("Format iDEB tidak valid: diharapkan ',' atau ']'")
+
+def iter_ideb_stream(fh, meta, chunk_size=STREAM_CHUNK_SIZE):
+    # Menghasilkan fasilitas satu per satu; header & field individual yang kecil dikumpulkan ke `meta`
+    js = _JsonStream(fh, chunk_size)
+    meta.setdefault('header', {}); meta.setdefault('individual', {})
+    for key in js.iter_object():
+        if key != 'individual' or js.peek() != '{':
+            val = js.value()
+            if key == 'header': meta['header'] = val
+            continue
+        for ind_key in js.iter_object():
+            if ind_key == 'fasilitas' and js.peek() == '{':
+                for _ in js.iter_object():
+                    if js.peek() == '[': yield from js.iter_array()
+                    else: js.value()
+            else:
+                val = js.value()
+                if ind_key in INDIVIDUAL_FIELDS: meta['individual'][ind_key] = val
+
+def parse_ideb_stream(fh, digest=None, chunk_size=STREAM_CHUNK_SIZE):
+    reader = _HashingReader(fh)
+    meta = {}
+    # Decode, parsing JSON, dan pembentukan tabel berjalan bersamaan per potongan, jadi diukur sebagai satu tahap
+    with stage("stream_facility_table"): facilities = build_facility_table(iter_ideb_stream(reader, meta, chunk_size))
+    while reader.read(1024 * 1024): pass  # sisa trailing whitespace tetap ikut di-hash
+    return build_parsed(digest or reader.sha.hexdigest(), meta['header'], meta['individual'], facilities)
+
+def parse_ideb_file(path, digest=None):
+    if os.path.getsize(path) < STREAM_THRESHOLD:
+        with open(path, 'rb') as fh: return parse_ideb(fh.read(), digest)
+    with open(path, 'rb') as fh: return parse_ideb_stream(fh, digest)
+
+# --- CACHE HASIL PARSING ---
+class LRUCache:
+    # LRU sederhana dengan batas jumlah entri, aman dipakai lintas sesi/thread Streamlit
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        value = build()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock: self._items.clear()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+_parse_cache = LRUCache(max_entries=64)
+
+def parse_ideb_cached(raw_bytes, store=None):
+    # Kunci cache = SHA-256 isi file, jadi file yang sama dengan nama berbeda tetap di-parse sekali
+    # store (opsional, mis. store.ResultStore): hasil yang pernah disimpan dimuat dari disk, hasil baru ikut disimpan
+    digest = file_hash(raw_bytes)
+    def build():
+        parsed = store.load(digest) if store is not None else None
+        if parsed is not None: return parsed
+        if len(raw_bytes) < STREAM_THRESHOLD: parsed = parse_ideb(raw_bytes, digest)
+        else: parsed = parse_ideb_stream(io.BytesIO(raw_bytes), digest)
+        if store is not None: store.save(parsed)
+        return parsed
+    return _parse_cache.get_or_build(digest, build)
+
+# --- FILTER & PEMETAAN FORMAT SLIK ---
+def apply_filters(df_full, bank=None, jenis_penggunaan=None, jenis=None, kondisi=None):
+    df_f = df_full
+    if bank: df_f = df_f[df_f['NAMA JASA KEUANGAN'].isin(bank)]
+    if jenis_penggunaan: df_f = df_f[df_f['JENIS_MAPPED'].isin(jenis_penggunaan)]
+    if jenis: df_f = df_f[df_f['JENIS_ORIGINAL'].isin(jenis)]
+    if kondisi: df_f = df_f[df_f['KONDISI'].isin(kondisi)]
+    df_f = df_f.copy()
+    df_f['NO'] = range(1, len(df_f) + 1)
+    return df_f
+
+def apply_slik_format(df_f, sel_format, keep_money=False):
+    df_f = format_facilities(df_f, keep_money)
+    if sel_format == "slik 3 (Egie)":
+        df_c = df_f.rename(columns={
+            "JENIS_MAPPED": "Jenis Penggunaan",
+            "NAMA JASA KEUANGAN": "Bank",
+            "BAKI DEBET": "OS",
+            "KOL_TERAKHIR": "Kol Terakhir",
+            "KOL_TERBURUK": "Kol Terburuk",
+            "BUNGA": "Suku Bunga"
+        })
+        df_c["Jumlah Hari Kol"] = "-"
+        df_c["Restrukturisasi Iya"] = np.where(df_c["RESTRUK"] == "Y", "✔", "")
+        df_c["Restrukturisasi Tidak"] = np.where(df_c["RESTRUK"] == "N", "✔", "")
+
+        cols_slik3 = ["NO", "Jenis Penggunaan", "Bank", "OS", "Kol Terakhir", "Kol Terburuk", "Jumlah Hari Kol", "Suku Bunga", "Restrukturisasi Iya", "Restrukturisasi Tidak"]
+        return df_c[cols_slik3]
+
+    if sel_format == "slik 2 (Aldista)":
+        df_b = df_f.rename(columns={
+            "JENIS_MAPPED": "Jenis Penggunaan",
+            "NAMA JASA KEUANGAN": "Bank/Lembaga pembiayaan",
+            "JENIS_ORIGINAL": "Jenis",
+            "PLAFON_AWAL": "Plafon Awal",
+            "BAKI DEBET": "OS (Rp)",
+            "TGL_MULAI": "Tanggal Akad Akhir",
+            "JATUH_TEMPO": "Tanggal Jatuh Tempo",
+            "KOL_TERAKHIR": "Kol Terakhir",
+            "KOL_TERBURUK": "Kol terburuk",
+            "BUNGA": "Rate (%)",
+            "RESTRUK": "Restrukturisasi",
+            "KONDISI": "Kondisi"
+        })
+        df_b["Jumlah Hari Kol"] = "-"
+        cols = ["NO", "Jenis Penggunaan", "Bank/Lembaga pembiayaan", "Jenis", "Plafon Awal", "OS (Rp)", "Tanggal Akad Akhir", "Tanggal Jatuh Tempo", "Kol Terakhir", "Kol terburuk", "Jumlah Hari Kol", "Rate (%)", "Restrukturisasi", "Kondisi"]
+        return df_b[cols]
+
+    df_d = df_f.rename(columns={
+        "JENIS_ORIGINAL": "JENIS",
+        "JENIS_MAPPED": "JENIS PENGGUNAAN",
+        "TGL_MULAI": "TGL AKAD AKHIR",
+        "JATUH_TEMPO": "TGL JATUH TEMPO",
+        "KOL_TERAKHIR": "KOL TERAKHIR",
+        "KOL_TERBURUK": "KOL TERBURUK"
+    })
+    cols_slik1 = ["NO", "NAMA JASA KEUANGAN", "JENIS", "JENIS PENGGUNAAN", "PLAFON", "BAKI DEBET", "TGL AKAD AKHIR", "TGL JATUH TEMPO", "KOL TERAKHIR", "KOL TERBURUK", "BUNGA", "KONDISI"]
+    return df_d[cols_slik1]
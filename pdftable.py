@@ -0,0 +1,127 @@
+import pandas as pd
+
+from ideb import safe_text
+
+# Mesin tabel PDF untuk fpdf2: lebar kolom diukur sekali dari data, teks dibungkus (bukan dipotong),
+# header diulang di setiap halaman, dan garis tabel digambar per baris/halaman (bukan per sel).
+
+class _Metrics:
+    # Lebar teks dihitung langsung dari tabel lebar karakter font core, dengan cache per string
+    def __init__(self, pdf, family, style, size):
+        pdf.set_font(family, style, size)
+        self.family, self.style, self.size = family, style, size
+        self._cw = pdf.current_font.cw
+        self._scale = size / 1000 / pdf.k
+        self._cache = {}
+
+    def width(self, text):
+        w = self._cache.get(text)
+        if w is None:
+            cw = self._cw
+            w = self._cache[text] = sum(cw.get(c, 500) for c in text) * self._scale
+        return w
+
+    def wrap(self, text, max_w):
+        # Pembungkusan per kata; kata yang lebih lebar dari kolom dipecah per karakter
+        if self.width(text) <= max_w: return [text]
+        lines, cur = [], ""
+        for word in text.split(" "):
+            cand = f"{cur} {word}" if cur else word
+            if self.width(cand) <= max_w:
+                cur = cand; continue
+            if cur: lines.append(cur)
+            cur = ""
+            while self.width(word) > max_w and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and self.width(word[:cut]) > max_w: cut -= 1
+                lines.append(word[:cut]); word = word[cut:]
+            cur = word
+        if cur: lines.append(cur)
+        return lines
+
+def _longest_word(metrics, texts):
+    return max((metrics.width(w) for t in texts for w in t.split(" ")), default=0.0)
+
+def measure_columns(header, columns, head_m, body_m, padding, total_w):
+    # Lebar ideal = teks terpanjang; lebar minimum = kata terpanjang. Sisa/kekurangan ruang dibagi proporsional
+    ideal, minimum = [], []
+    for name, values in zip(header, columns):
+        uniq = set(values)
+        ideal.append(max(_longest_word(head_m, [name]), max((body_m.width(v) for v in uniq), default=0.0)) + 2 * padding)
+        minimum.append(max(_longest_word(head_m, [name]), _longest_word(body_m, uniq)) + 2 * padding)
+    if sum(ideal) <= total_w:
+        return [w * total_w / sum(ideal) for w in ideal]
+    if sum(minimum) >= total_w:
+        return [w * total_w / sum(minimum) for w in minimum]
+    slack = (total_w - sum(minimum)) / (sum(ideal) - sum(minimum))
+    return [m + (i - m) * slack for m, i in zip(minimum, ideal)]
+
+def render_table(pdf, df, align=None, family="Helvetica", header_size=6, body_size=5, padding=1.0, line_spacing=1.3):
+    # align: dict nama kolom -> 'L'/'C'/'R' (default 'C')
+    if df.empty: return
+    header = [safe_text(c) for c in df.columns]
+    columns = []
+    for col in df.columns:
+        s = df[col].astype(object)
+        uniq = pd.unique(s)
+        mapping = {v: safe_text(v) for v in uniq}
+        columns.append([mapping[v] for v in s])
+    align = [(align or {}).get(c, "C") for c in df.columns]
+
+    head_m = _Metrics(pdf, family, "B", header_size)
+    body_m = _Metrics(pdf, family, "", body_size)
+    widths = measure_columns(header, columns, head_m, body_m, padding, pdf.epw)
+    xs = [pdf.l_margin]
+    for w in widths: xs.append(xs[-1] + w)
+
+    head_lh = header_size / pdf.k * line_spacing
+    body_lh = body_size / pdf.k * line_spacing
+    head_lines = [head_m.wrap(h, w - 2 * padding) for h, w in zip(header, widths)]
+    head_h = max(len(l) for l in head_lines) * head_lh + 2 * padding
+    wrap_cache = [{} for _ in widths]
+
+    def draw_grid(top, bottom, row_ys):
+        for y in row_ys: pdf.line(xs[0], y, xs[-1], y)
+        for x in xs: pdf.line(x, top, x, bottom)
+
+    def draw_header(y):
+        pdf.set_font(family, "B", header_size)
+        for i, lines in enumerate(head_lines):
+            _draw_lines(pdf, head_m, lines, xs[i], widths[i], y + padding, head_lh, "C", padding)
+        pdf.set_font(family, "", body_size)
+        return y + head_h
+
+    page_top = pdf.get_y()
+    if page_top + head_h + body_lh + 2 * padding > pdf.page_break_trigger:
+        pdf.add_page(); page_top = pdf.get_y()
+    y = draw_header(page_top)
+    row_ys = [page_top, y]
+    for r in range(len(columns[0])):
+        cells = []
+        for i, col in enumerate(columns):
+            text = col[r]
+            lines = wrap_cache[i].get(text)
+            if lines is None: lines = wrap_cache[i][text] = body_m.wrap(text, widths[i] - 2 * padding)
+            cells.append(lines)
+        row_h = max(len(l) for l in cells) * body_lh + 2 * padding
+        if y + row_h > pdf.page_break_trigger:
+            # Tutup grid halaman ini, lalu ulangi header di halaman berikutnya
+            draw_grid(page_top, y, row_ys)
+            pdf.add_page(); page_top = pdf.get_y()
+            y = draw_header(page_top)
+            row_ys = [page_top, y]
+        for i, lines in enumerate(cells):
+            _draw_lines(pdf, body_m, lines, xs[i], widths[i], y + padding, body_lh, align[i], padding)
+        y += row_h
+        row_ys.append(y)
+    draw_grid(page_top, y, row_ys)
+    pdf.set_xy(pdf.l_margin, y)
+
+def _draw_lines(pdf, metrics, lines, x, w, top, lh, align, padding):
+    # pdf.text memakai baseline, jadi digeser ~80% tinggi huruf dari atas baris
+    base = top + lh * 0.8
+    for k, line in enumerate(lines):
+        if align == "L": tx = x + padding
+        elif align == "R": tx = x + w - padding - metrics.width(line)
+        else: tx = x + (w - metrics.width(line)) / 2
+        pdf.text(tx, base + k * lh, line)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from ideb import LRUCache, format_facilities
+
+# Kolom yang diberi indeks kategori: key filter -> nama kolom di tabel portofolio
+INDEX_COLS = {"bank": "NAMA JASA KEUANGAN", "jenis_penggunaan": "JENIS_MAPPED", "kondisi": "KONDISI", "kol": "KOL_BUCKET"}
+DISPLAY_COLS = ["NO", "NIK", "NAMA DEBITUR", "FILE", "NAMA JASA KEUANGAN", "JENIS_ORIGINAL", "JENIS_MAPPED", "PLAFON", "BAKI DEBET",
+                "TGL_MULAI", "JATUH_TEMPO", "KOL_TERAKHIR", "KOL_TERBURUK", "BUNGA", "KONDISI"]
+
+def kol_label(kol):
+    return f"Kol {kol}" if kol > 0 else "Kol -"
+
+class Portfolio:
+    # Gabungan fasilitas seluruh debitur dalam satu tabel kolumnar dengan indeks kategori siap pakai
+    def __init__(self, table):
+        self.table = table
+        self._index = {key: self._build_index(table[col]) for key, col in INDEX_COLS.items()}
+
+    @staticmethod
+    def _build_index(column):
+        # Indeks terbalik: kategori -> posisi baris, dari satu kali argsort atas kode kategori
+        codes = column.cat.codes.to_numpy()
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(column.cat.categories) + 1))
+        return {cat: order[bounds[i]:bounds[i + 1]] for i, cat in enumerate(column.cat.categories)}
+
+    def options(self, key):
+        return [cat for cat, pos in self._index[key].items() if len(pos)]
+
+    def filter(self, **selected):
+        mask = None
+        for key, values in selected.items():
+            if not values: continue
+            hit = np.zeros(len(self.table), dtype=bool)
+            for val in values:
+                pos = self._index[key].get(val)
+                if pos is not None: hit[pos] = True
+            mask = hit if mask is None else (mask & hit)
+        return self.table if mask is None else self.table[mask]
+
+    @staticmethod
+    def totals_by(df, key):
+        col = INDEX_COLS.get(key, key)
+        out = df.groupby(col, observed=True).agg(FASILITAS=("NO", "size"), PLAFON=("PLAFON", "sum"), OUTSTANDING=("BAKI DEBET", "sum"))
+        return out.sort_values("OUTSTANDING", ascending=False).reset_index()
+
+    @staticmethod
+    def utilisation_by_debtor(df):
+        out = df.groupby(["NIK", "NAMA DEBITUR"], observed=True).agg(FASILITAS=("NO", "size"), PLAFON=("PLAFON", "sum"), OUTSTANDING=("BAKI DEBET", "sum"),
+                                                                     KOL_TERBURUK=("KOL_TERBURUK", "max"))
+        out["UTILISASI (%)"] = (out["OUTSTANDING"] / out["PLAFON"].replace(0, np.nan) * 100).fillna(0).round(2)
+        return out.reset_index()
+
+def build_portfolio(parsed_files):
+    # parsed_files: list (nama file, ParsedIdeb)
+    frames = [parsed.facilities.assign(NIK=parsed.identity.nik, **{"NAMA DEBITUR": parsed.identity.nama, "FILE": name})
+              for name, parsed in parsed_files]
+    table = pd.concat(frames, ignore_index=True)
+    table["NO"] = np.arange(1, len(table) + 1)
+    table["KOL_BUCKET"] = table["KOL_TERBURUK"].map(kol_label)
+    for col in ["NIK", "NAMA DEBITUR", "FILE"] + list(INDEX_COLS.values()):
+        table[col] = table[col].astype("category")
+    return Portfolio(table)
+
+_portfolio_cache = LRUCache(max_entries=8)
+
+def build_portfolio_cached(parsed_files):
+    key = tuple((name, parsed.file_hash) for name, parsed in parsed_files)
+    return _portfolio_cache.get_or_build(key, lambda: build_portfolio(parsed_files))
+
+def format_portfolio(df):
+    out = format_facilities(df.drop(columns=["KOL_BUCKET"]))
+    out["NO"] = range(1, len(out) + 1)
+    return out[DISPLAY_COLS]
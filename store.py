@@ -0,0 +1,172 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from diagnostics import stage
+from ideb import PARSER_VERSION, AuditSummary, DebtorIdentity, ParsedIdeb
+
+# Penyimpanan lokal (SQLite) hasil parsing: ringkasan debitur + baris fasilitas, dikunci oleh NIK, hash file, dan tanggalHasil.
+# File yang pernah diproses dimuat dari sini tanpa parsing ulang, dan riwayat per NIK bisa dikueri lewat indeks.
+# Store berisi data pribadi debitur (NIK, nama, alamat, NPWP), jadi hanya aktif bila env BRISLIK_STORE diisi:
+# path database, atau "1"/"on" untuk lokasi default ~/.brislik/brislik.db.
+
+logger = logging.getLogger("brislik.store")
+ENV_PATH = "BRISLIK_STORE"
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".brislik", "brislik.db")
+SCHEMA_VERSION = 2
+
+IDENTITY_FIELDS = ("nama", "nik", "alamat", "tgl", "tmpt_lahir", "tgl_lahir", "jk", "npwp", "pekerjaan")
+# Kolom tabel fasilitas internal -> kolom SQLite
+FACILITY_COLUMNS = {
+    "NO": "no", "NAMA JASA KEUANGAN": "bank", "JENIS_ORIGINAL": "jenis_original", "JENIS_MAPPED": "jenis_mapped",
+    "PLAFON": "plafon", "PLAFON_AWAL": "plafon_awal", "BAKI DEBET": "baki_debet", "TGL_MULAI": "tgl_mulai",
+    "JATUH_TEMPO": "jatuh_tempo", "KOL_TERAKHIR": "kol_terakhir", "KOL_TERBURUK": "kol_terburuk", "BUNGA": "bunga",
+    "KONDISI": "kondisi", "RESTRUK": "restruk",
+}
+FACILITY_DTYPES = {"NO": np.int64, "PLAFON": np.int64, "PLAFON_AWAL": np.int64, "BAKI DEBET": np.int64,
+                   "KOL_TERAKHIR": np.int8, "KOL_TERBURUK": np.int8, "BUNGA": np.float64}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    file_hash TEXT PRIMARY KEY,
+    parser_version INTEGER NOT NULL,
+    nik TEXT NOT NULL,
+    tanggal_hasil TEXT,
+    posisi TEXT,
+    nama TEXT, alamat TEXT, tgl TEXT, tmpt_lahir TEXT, tgl_lahir TEXT, jk TEXT, npwp TEXT, pekerjaan TEXT,
+    skor TEXT, plafon REAL, baki REAL, total_kred INTEGER,
+    kol_terburuk INTEGER, n_facilities INTEGER,
+    stored_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_nik ON reports (nik, tanggal_hasil, posisi, stored_at);
+CREATE TABLE IF NOT EXISTS facilities (
+    file_hash TEXT NOT NULL REFERENCES reports (file_hash) ON DELETE CASCADE,
+    no INTEGER NOT NULL,
+    bank TEXT, jenis_original TEXT, jenis_mapped TEXT,
+    plafon INTEGER, plafon_awal INTEGER, baki_debet INTEGER,
+    tgl_mulai TEXT, jatuh_tempo TEXT,
+    kol_terakhir INTEGER, kol_terburuk INTEGER, bunga REAL,
+    kondisi TEXT, restruk TEXT,
+    PRIMARY KEY (file_hash, no)
+) WITHOUT ROWID;
+"""
+
+def _iso_date(text):
+    # DebtorIdentity.tgl berformat dd-mm-YYYY; disimpan ISO agar urutan teks = urutan tanggal
+    try: return datetime.strptime(text, "%d-%m-%Y").date().isoformat()
+    except (TypeError, ValueError): return None
+
+def _facility_rows(file_hash, df):
+    cols = []
+    for col in FACILITY_COLUMNS:
+        s = df[col]
+        if col in ("TGL_MULAI", "JATUH_TEMPO"): cols.append(s.dt.strftime("%Y-%m-%d").astype(object).where(s.notna(), None).tolist())
+        elif col == "BUNGA": cols.append(s.astype(object).where(s.notna(), None).tolist())
+        else: cols.append(s.tolist())
+    return ((file_hash, *row) for row in zip(*cols))
+
+class ResultStore:
+    # Satu koneksi dipakai bersama lintas thread Streamlit, dijaga lock seperti LRUCache
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        if path != ":memory:": os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._migrate()
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _migrate(self):
+        # Skema lama hanya berisi turunan file .txt, jadi dibuang lalu dibuat ulang; skema yang lebih baru tidak disentuh
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        has_tables = self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reports'").fetchone() is not None
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"Database {self.path} memakai skema versi {version}, lebih baru dari versi aplikasi ({SCHEMA_VERSION})")
+        if has_tables and version < SCHEMA_VERSION:
+            logger.warning("Skema store %s versi %s usang, tabel dibuat ulang ke versi %s", self.path, version, SCHEMA_VERSION)
+            self._conn.execute("DROP TABLE IF EXISTS facilities")
+            self._conn.execute("DROP TABLE IF EXISTS reports")
+
+    def __len__(self):
+        with self._lock: return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def save(self, parsed):
+        # Mengembalikan False bila file (hash yang sama) sudah tersimpan dari parser versi ini; versi lama ditimpa
+        ident, summ, df = parsed.identity, parsed.summary, parsed.facilities
+        kol = int(df["KOL_TERBURUK"].max()) if len(df) else 0
+        report = {"file_hash": parsed.file_hash, "parser_version": PARSER_VERSION, "tanggal_hasil": _iso_date(ident.tgl), "posisi": summ.posisi,
+                  **{f: getattr(ident, f) for f in IDENTITY_FIELDS},
+                  "skor": str(summ.skor), "plafon": summ.plafon, "baki": summ.baki, "total_kred": summ.total_kred,
+                  "kol_terburuk": kol, "n_facilities": len(df), "stored_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        with stage("store_save"), self._lock, self._conn:
+            self._conn.execute("DELETE FROM reports WHERE file_hash = ? AND parser_version != ?", (parsed.file_hash, PARSER_VERSION))
+            cur = self._conn.execute(f"INSERT OR IGNORE INTO reports ({', '.join(report)}) VALUES ({', '.join('?' * len(report))})",
+                                     tuple(report.values()))
+            if not cur.rowcount: return False
+            sql_cols = ", ".join(FACILITY_COLUMNS.values())
+            self._conn.executemany(f"INSERT INTO facilities (file_hash, {sql_cols}) VALUES ({', '.join('?' * (len(FACILITY_COLUMNS) + 1))})",
+                                   _facility_rows(parsed.file_hash, df))
+        return True
+
+    def load(self, file_hash):
+        # ParsedIdeb dengan tipe kolom yang sama persis seperti hasil build_facility_table, atau None
+        # (juga None bila disimpan oleh parser versi lain, sehingga file di-parse ulang lalu disimpan kembali)
+        with stage("store_load"), self._lock:
+            cur = self._conn.execute("SELECT * FROM reports WHERE file_hash = ? AND parser_version = ?", (file_hash, PARSER_VERSION))
+            row = cur.fetchone()
+            if row is None: return None
+            rep = dict(zip([d[0] for d in cur.description], row))
+            sql_cols = ", ".join(FACILITY_COLUMNS.values())
+            rows = self._conn.execute(f"SELECT {sql_cols} FROM facilities WHERE file_hash = ? ORDER BY no", (file_hash,)).fetchall()
+        df = pd.DataFrame(rows, columns=list(FACILITY_COLUMNS), dtype=object)
+        for col, dtype in FACILITY_DTYPES.items(): df[col] = df[col].astype(dtype)
+        for col in ("TGL_MULAI", "JATUH_TEMPO"): df[col] = pd.to_datetime(df[col], format="%Y-%m-%d")
+        for col in ("NAMA JASA KEUANGAN", "JENIS_ORIGINAL", "JENIS_MAPPED", "KONDISI", "RESTRUK"): df[col] = df[col].astype(str)
+        return ParsedIdeb(
+            file_hash=file_hash,
+            identity=DebtorIdentity(**{f: rep[f] for f in IDENTITY_FIELDS}),
+            summary=AuditSummary(skor=rep["skor"], plafon=rep["plafon"], baki=rep["baki"], total_kred=rep["total_kred"], posisi=rep["posisi"]),
+            facilities=df,
+        )
+
+    def history(self, nik):
+        # Riwayat laporan satu NIK (urut tanggalHasil): total bakiDebet, plafon, dan kol terburuk per laporan
+        with stage("store_history"), self._lock:
+            cur = self._conn.execute(
+                "SELECT tanggal_hasil, posisi, baki, plafon, skor, kol_terburuk, n_facilities, file_hash FROM reports "
+                "WHERE nik = ? ORDER BY tanggal_hasil, posisi, stored_at", (nik,))
+            rows = cur.fetchall()
+        out = pd.DataFrame(rows, columns=["TANGGAL_HASIL", "POSISI", "BAKI DEBET", "PLAFON", "SKOR", "KOL_TERBURUK", "FASILITAS", "FILE_HASH"])
+        out["TANGGAL_HASIL"] = pd.to_datetime(out["TANGGAL_HASIL"], format="%Y-%m-%d")
+        out["PERUBAHAN BAKI"] = out["BAKI DEBET"].diff()
+        return out
+
+    def close(self):
+        with self._lock: self._conn.close()
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def store_path():
+    # None (nonaktif) kecuali BRISLIK_STORE diisi secara eksplisit
+    path = os.environ.get(ENV_PATH, "").strip()
+    if path.lower() in ("", "0", "off", "false", "no"): return None
+    return DEFAULT_PATH if path.lower() in ("1", "on", "true", "yes") else path
+
+def open_store(path):
+    # Satu ResultStore per path untuk seluruh sesi/thread dalam proses ini
+    with _stores_lock:
+        if path not in _stores: _stores[path] = ResultStore(path)
+        return _stores[path]
+
+def default_store():
+    path = store_path()
+    return None if path is None else open_store(path)
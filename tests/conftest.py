@@ -0,0 +1,24 @@
+import pytest
+
+# Data uji bersama: satu laporan iDEB minimal (RAW) dan pembuat item fasilitas mentah
+
+RAW = ('{"header": {"tanggalHasil": "20250305101530"}, "individual": {"posisiDataTerakhir": "202502",'
+       ' "dataPokokDebitur": [{"namaDebitur": "Budi", "noIdentitas": "3201000000000001"}],'
+       ' "ringkasanFasilitas": {"plafonEfektifTotal": "100000000", "bakiDebetTotal": "25000000", "kualitasTerburuk": "2"},'
+       ' "fasilitas": {"kreditPembiayan": [{"ljkKet": "PT BANK A", "kondisiKet": "Fasilitas Aktif", "plafon": "100000000",'
+       ' "bakiDebet": "25000000", "kualitas": "1", "tahunBulan01Kol": "2"}]}}}').encode()
+
+def _facility(bank, kondisi, **extra):
+    f = {"ljkKet": bank, "jenisPenggunaanKet": "Modal Kerja", "jenisKreditPembiayaanKet": "Kredit Modal Kerja",
+         "plafon": "100000000", "bakiDebet": "25000000", "tanggalMulai": "20200115", "tanggalJatuhTempo": "20300115",
+         "kualitas": "1", "sukuBungaImbalan": "9.5", "kondisiKet": kondisi, "tahunBulan01Kol": "2"}
+    f.update(extra)
+    return f
+
+@pytest.fixture
+def raw():
+    return RAW
+
+@pytest.fixture
+def make_facility():
+    return _facility
@@ -0,0 +1,35 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import pytest
+
+import cli
+
+class BrokenPool:
+    # Meniru worker yang mati mendadak (mis. OOM): setiap future gagal dengan BrokenProcessPool
+    def __init__(self, max_workers=None): pass
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+    def submit(self, fn, *args):
+        fut = Future()
+        fut.set_exception(BrokenProcessPool("worker mati"))
+        return fut
+
+def test_parquet_summary_checked_before_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli.importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        cli.run_batch(str(tmp_path), str(tmp_path / "out"), summary_path=str(tmp_path / "s.parquet"))
+    assert not (tmp_path / "out").exists()
+    with pytest.raises(SystemExit):
+        cli.main([str(tmp_path), "-o", str(tmp_path / "out"), "--summary", str(tmp_path / "s.parquet")])
+
+def test_worker_crash_recorded_per_file(tmp_path, monkeypatch, raw):
+    for i in range(2): (tmp_path / f"ideb_{i}.txt").write_bytes(raw)
+    monkeypatch.setattr(cli, "ProcessPoolExecutor", BrokenPool)
+    summary = tmp_path / "s.csv"
+    stats = cli.run_batch(str(tmp_path), str(tmp_path / "out"), summary_path=str(summary), log=lambda msg: None)
+    assert stats["error"] == 2 and stats["ok"] == 0
+    df = pd.read_csv(summary)
+    assert df["status"].tolist() == ["error", "error"] and df["error"].str.contains("berhenti mendadak").all()
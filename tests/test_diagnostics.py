@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+import diagnostics
+
+@pytest.fixture
+def diag():
+    diagnostics.clear(); diagnostics.enable(True)
+    yield diagnostics
+    diagnostics.enable(False); diagnostics.clear(); diagnostics.set_session_resolver(None)
+
+def _by_stage(recs):
+    return {r["stage"]: r for r in recs}
+
+def test_peak_measured_for_single_thread(diag):
+    with diag.stage("luar", file="a.txt"):
+        with diag.stage("dalam"): buf = bytearray(8 * 2 ** 20)
+        del buf
+    recs = _by_stage(diag.records())
+    assert recs["dalam"]["file"] == "a.txt" and recs["dalam"]["depth"] == 1
+    assert recs["dalam"]["peak_bytes"] >= 8 * 2 ** 20 and recs["luar"]["peak_bytes"] >= 8 * 2 ** 20
+
+def test_overlapping_threads_do_not_report_wiped_peak(diag):
+    # Thread B membuka stage selagi A masih berjalan: puncak A tidak boleh tercatat dari counter yang sudah di-reset
+    a_started, b_done = threading.Event(), threading.Event()
+    def thread_a():
+        with diag.stage("A"):
+            buf = bytearray(16 * 2 ** 20); del buf
+            a_started.set(); b_done.wait(5)
+    def thread_b():
+        a_started.wait(5)
+        with diag.stage("B"): pass
+        b_done.set()
+    threads = [threading.Thread(target=thread_a), threading.Thread(target=thread_b)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    recs = _by_stage(diag.records())
+    assert recs["A"]["peak_bytes"] is None and recs["B"]["peak_bytes"] is None
+    with diag.stage("C"): pass
+    assert _by_stage(diag.records())["C"]["peak_bytes"] is not None
+
+def test_records_and_clear_per_session(diag):
+    current = {"sid": "s1"}
+    diag.set_session_resolver(lambda: current["sid"])
+    with diag.stage("x1"): pass
+    current["sid"] = "s2"
+    with diag.stage("x2"): pass
+    with diag.stage("x3", session="s1"): pass
+    assert [r["stage"] for r in diag.records("s1")] == ["x1", "x3"]
+    diag.clear("s1")
+    assert [r["stage"] for r in diag.records()] == ["x2"]
@@ -0,0 +1,29 @@
+import io
+
+import pytest
+
+from exporters import export_word
+from ideb import SLIK_FORMATS, apply_slik_format, build_facility_table, parse_ideb
+
+docx = pytest.importorskip("docx")
+from docx.oxml.ns import qn  # noqa: E402
+
+def _word_table(raw, facilities):
+    parsed = parse_ideb(raw)
+    df = apply_slik_format(build_facility_table(facilities), SLIK_FORMATS[0])
+    doc = docx.Document(io.BytesIO(export_word(parsed.identity.as_dict(), parsed.summary.as_dict(), df)))
+    return doc.tables[0], df
+
+def test_long_value_round_trips_untruncated(raw, make_facility):
+    name = "PT BANK PEMBANGUNAN DAERAH & <SYARIAH> \"UNIT\" KC JAKARTA UTR"
+    assert len(name) == 60
+    table, df = _word_table(raw, [make_facility(name, "Fasilitas Aktif"), make_facility("PT BANK B", "Lunas")])
+    assert [c.text for c in table.rows[0].cells] == list(df.columns)
+    col = list(df.columns).index("NAMA JASA KEUANGAN")
+    assert [r.cells[col].text for r in table.rows[1:]] == [name, "PT BANK B"]
+
+def test_header_row_repeats(raw, make_facility):
+    table, _ = _word_table(raw, [make_facility("PT BANK A", "Fasilitas Aktif")])
+    tr_pr = table.rows[0]._tr.trPr
+    assert tr_pr is not None and tr_pr.find(qn("w:tblHeader")) is not None
+    assert table.rows[1]._tr.trPr is None
@@ -0,0 +1,33 @@
+import io
+import os
+import subprocess
+import sys
+import zipfile
+
+from openpyxl import load_workbook
+
+from exporters import build_zip
+from ideb import SLIK_FORMATS, parse_ideb
+
+def test_zip_combined_sheet_uses_single_layout(raw):
+    # Debitur dengan format slik berbeda tetap digabung dalam satu tata letak kolom (slik 1)
+    parsed = parse_ideb(raw)
+    jobs = [(f"d{i}", f"Audit_{i}", parsed, fmt, {}) for i, fmt in enumerate(SLIK_FORMATS)]
+    spool = build_zip(jobs, kinds=("xlsx",), workers=1)
+    with zipfile.ZipFile(spool) as zf:
+        assert "ERRORS.txt" not in zf.namelist()
+        wb = load_workbook(io.BytesIO(zf.read("Semua_Debitur.xlsx")), read_only=True)
+    rows = list(wb["Gabungan"].iter_rows(values_only=True))
+    assert rows[0] == ("NO", "NIK", "NAMA", "NAMA JASA KEUANGAN", "JENIS", "JENIS PENGGUNAAN", "PLAFON", "BAKI DEBET",
+                       "TGL AKAD AKHIR", "TGL JATUH TEMPO", "KOL TERAKHIR", "KOL TERBURUK", "BUNGA", "KONDISI")
+    assert len(rows) == 1 + len(SLIK_FORMATS)
+
+def test_import_without_openpyxl():
+    # Tanpa openpyxl modul tetap bisa diimpor (app.py menampilkan MISSING_LIBS_MSG); ekspor Excel gagal dengan pesan itu
+    code = ("import sys; sys.modules['openpyxl'] = None\n"
+            "import exporters\n"
+            "assert not exporters.HAS_EXCEL_LIB\n"
+            "try: exporters.export_excel({}, {}, None)\n"
+            "except ImportError as e: assert str(e) == exporters.MISSING_LIBS_MSG\n"
+            "else: raise AssertionError('export_excel tanpa openpyxl')\n")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
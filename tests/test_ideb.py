@@ -0,0 +1,54 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from exporters import build_report
+from ideb import (SLIK_FORMATS, apply_filters, apply_slik_format, build_facility_table, format_facilities, parse_ideb,
+                  parse_ideb_stream)
+
+@pytest.fixture
+def table(make_facility):
+    return build_facility_table([make_facility("PT BANK A", "Fasilitas Aktif"), make_facility("PT ADIRA", "Lunas", sukuBungaImbalan="9,5")])
+
+@pytest.mark.parametrize("sel_format", SLIK_FORMATS)
+def test_empty_filter_result_formats(table, sel_format):
+    # Kombinasi filter tanpa baris cocok harus menghasilkan tabel kosong, bukan error
+    empty = apply_filters(table, bank=["PT ADIRA"], kondisi=["Fasilitas Aktif"])
+    assert empty.empty
+    assert apply_slik_format(empty, sel_format).empty
+    assert apply_slik_format(empty, sel_format, keep_money=True).empty
+
+def test_format_facilities(table):
+    out = format_facilities(table)
+    assert out["PLAFON"].tolist() == ["Rp 100.000.000", "Rp 100.000.000"]
+    assert out["TGL_MULAI"].tolist() == ["15-01-2020", "15-01-2020"]
+    assert out["KOL_TERBURUK"].tolist() == ["2", "2"]
+    assert out["BUNGA"].tolist() == ["9.5 %", "9.5 %"]  # "9,5" (desimal koma) dibaca sebagai 9.5
+
+@pytest.mark.parametrize("kind", ["xlsx", "docx", "pdf"])
+def test_report_with_empty_filter(kind, raw):
+    parsed = parse_ideb(raw)
+    for sel_format in SLIK_FORMATS:
+        assert build_report(parsed, sel_format, {"bank": ["TIDAK ADA"]}, kind)
+
+@pytest.fixture
+def stream_raw(make_facility):
+    # BOM, kutip ter-escape, karakter multibyte, dan key non-list di bawah fasilitas
+    facs = [make_facility(f'PT BANK "{i}" ÉÑ 日本', "Fasilitas Aktif", plafon=str(1000 * (i + 1))) for i in range(12)]
+    doc = {"header": {"tanggalHasil": "20250305101530", "catatan": "ß" * 50},
+           "individual": {"posisiDataTerakhir": "202502", "lainnya": [1, 2.5, None, True],
+                          "dataPokokDebitur": [{"namaDebitur": 'Bürgé "Ñ"', "noIdentitas": "3201000000000001"}],
+                          "ringkasanFasilitas": {"plafonEfektifTotal": "78000", "bakiDebetTotal": "300000000", "kualitasTerburuk": "2"},
+                          "fasilitas": {"jumlah": 12, "kreditPembiayan": facs[:8], "keterangan": {"x": "ü"}, "lc": facs[8:], "kosong": []}}}
+    return b"\xef\xbb\xbf" + json.dumps(doc, ensure_ascii=False, indent=1).encode()
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1024, 64 * 1024])
+def test_stream_parser_matches_parse_ideb(stream_raw, chunk_size):
+    expected = parse_ideb(stream_raw)
+    got = parse_ideb_stream(io.BytesIO(stream_raw), chunk_size=chunk_size)
+    assert got.file_hash == expected.file_hash
+    assert got.identity == expected.identity and got.summary == expected.summary
+    assert len(got.facilities) == 12
+    pd.testing.assert_frame_equal(got.facilities, expected.facilities)
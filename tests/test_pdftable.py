@@ -0,0 +1,38 @@
+import pytest
+
+from ideb import SLIK_FORMATS, apply_slik_format, build_facility_table
+from pdftable import render_table
+
+fpdf = pytest.importorskip("fpdf")
+
+class RecordingPDF(fpdf.FPDF):
+    # Mencatat setiap teks yang digambar (halaman, y, teks) agar isi tabel bisa diperiksa tanpa parser PDF
+    def __init__(self):
+        super().__init__("L", "mm", "A4")
+        self.drawn = []
+
+    def text(self, x, y, text=""):
+        self.drawn.append((self.page, y, text))
+        return super().text(x, y, text)
+
+def _render(facilities):
+    df = apply_slik_format(build_facility_table(facilities), SLIK_FORMATS[0])
+    pdf = RecordingPDF(); pdf.add_page()
+    render_table(pdf, df, align={c: "L" for c in df.columns[1:4]})
+    return pdf, df
+
+def test_header_repeats_after_page_break(make_facility):
+    pdf, df = _render([make_facility(f"PT BANK {i}", "Fasilitas Aktif") for i in range(150)])
+    assert pdf.pages_count > 1
+    for page in range(1, pdf.pages_count + 1):
+        texts = [t for p, _, t in pdf.drawn if p == page]
+        assert "PLAFON" in texts and "KONDISI" in texts
+    # Setiap baris data tergambar tepat sekali di seluruh halaman
+    assert sorted(t for _, _, t in pdf.drawn if t.startswith("PT BANK ")) == sorted(f"PT BANK {i}" for i in range(150))
+
+def test_long_bank_name_wraps_instead_of_truncating(make_facility):
+    name = "PT BANK " + " ".join(f"CABANG{i:02d}" for i in range(30))
+    pdf, _ = _render([make_facility(name, "Fasilitas Aktif")])
+    lines = sorted((y, t) for _, y, t in pdf.drawn if t.startswith("PT BANK") or t.startswith("CABANG"))
+    assert len(lines) > 1
+    assert " ".join(t for _, t in lines) == name
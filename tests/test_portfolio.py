@@ -0,0 +1,10 @@
+from ideb import parse_ideb
+from portfolio import Portfolio, build_portfolio, format_portfolio
+
+def test_empty_portfolio_filter(raw):
+    pf = build_portfolio([("a.txt", parse_ideb(raw))])
+    empty = pf.filter(bank=["PT BANK A"], kol=["Kol 5"])
+    assert empty.empty
+    assert format_portfolio(empty).empty
+    assert Portfolio.totals_by(empty, "bank").empty
+    assert Portfolio.utilisation_by_debtor(empty).empty
@@ -0,0 +1,48 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import ideb
+import store
+from ideb import parse_ideb, parse_ideb_cached
+from store import ResultStore
+
+def test_roundtrip_and_history(tmp_path, raw):
+    rs = ResultStore(str(tmp_path / "s.db"))
+    parsed = parse_ideb(raw)
+    assert rs.save(parsed) and not rs.save(parsed)
+    loaded = rs.load(parsed.file_hash)
+    pd.testing.assert_frame_equal(parsed.facilities, loaded.facilities)
+    assert loaded.identity == parsed.identity and loaded.summary == parsed.summary
+    hist = rs.history(parsed.identity.nik)
+    assert hist["BAKI DEBET"].tolist() == [25000000.0] and hist["KOL_TERBURUK"].tolist() == [2]
+
+def test_parser_version_change_forces_reparse(tmp_path, monkeypatch, raw):
+    rs = ResultStore(str(tmp_path / "s.db"))
+    parsed = parse_ideb(raw)
+    rs.save(parsed)
+    monkeypatch.setattr(store, "PARSER_VERSION", ideb.PARSER_VERSION + 1)
+    assert rs.load(parsed.file_hash) is None
+    ideb._parse_cache.clear()
+    assert parse_ideb_cached(raw, rs).file_hash == parsed.file_hash
+    assert rs.load(parsed.file_hash) is not None and len(rs) == 1
+
+def test_old_schema_rebuilt_newer_schema_refused(tmp_path, raw):
+    path = str(tmp_path / "s.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE reports (file_hash TEXT PRIMARY KEY, nik TEXT)")
+    conn.execute("PRAGMA user_version=1"); conn.commit(); conn.close()
+    rs = ResultStore(path)
+    assert rs.save(parse_ideb(raw)); rs.close()
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA user_version={store.SCHEMA_VERSION + 1}"); conn.commit(); conn.close()
+    with pytest.raises(RuntimeError): ResultStore(path)
+
+def test_store_is_opt_in(monkeypatch):
+    monkeypatch.delenv(store.ENV_PATH, raising=False)
+    assert store.store_path() is None
+    monkeypatch.setenv(store.ENV_PATH, "on")
+    assert store.store_path() == store.DEFAULT_PATH
+    monkeypatch.setenv(store.ENV_PATH, "/tmp/x.db")
+    assert store.store_path() == "/tmp/x.db"